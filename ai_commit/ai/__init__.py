@@ -4,6 +4,7 @@ AI client module for AI Commit.
 This module handles communication with AI providers to generate commit messages.
 """
 
+import re
 import time
 import logging
 import asyncio
@@ -16,6 +17,9 @@ from ..security import InputValidator
 
 logger = logging.getLogger(__name__)
 
+# Content between triple backticks, with an optional language tag line
+_CODEBLOCK_RE = re.compile(r'```(?:\w*\n)?(.*?)```', re.DOTALL)
+
 
 class AIClient:
     """Client for AI-powered commit message generation."""
@@ -227,14 +231,11 @@ Generate only the commit message, wrapped in triple backticks."""
         Returns:
             Extracted commit message
         """
-        import re
-
         # Try to find content between triple backticks
-        pattern = r'```(?:\w*\n)?(.*?)```'
-        matches = re.findall(pattern, text, re.DOTALL)
+        match = _CODEBLOCK_RE.search(text)
 
-        if matches:
-            message = matches[0].strip()
+        if match:
+            message = match.group(1).strip()
             logger.debug(f"Extracted message from backticks: {message}")
             return message
 
@@ -5,9 +5,10 @@ This module provides the command-line interface using the new modular architectu
 """
 
 import argparse
+import functools
 import logging
 import sys
-from typing import Optional
+from typing import List, Optional
 
 from .config import ConfigurationLoader, AICommitConfig
 from .git import GitOperations
@@ -20,8 +21,9 @@ from .exceptions import (
 )
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once and reuse it."""
     parser = argparse.ArgumentParser(description='AI-powered git commit message generator')
 
     # Main command options
@@ -53,7 +55,20 @@ def parse_args() -> argparse.Namespace:
     set_key_parser.add_argument('provider', help='AI provider (e.g., openai)')
     set_key_parser.add_argument('api_key', help='API key to store')
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Arguments to parse; defaults to ``sys.argv[1:]``
+
+    Returns:
+        Parsed arguments namespace
+    """
+    return _build_parser().parse_args(argv)
 
 
 class AICommitWorkflow:
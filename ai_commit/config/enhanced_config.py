@@ -8,13 +8,19 @@ import os
 import json
 import yaml
 import logging
-from typing import Dict, Any, Optional, Union, List, Callable
+from typing import Dict, Any, Optional, Union, List, Callable, Protocol
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
 from ..exceptions import ConfigurationError
 
+# 优先使用 libyaml 的 C 实现，未安装 libyaml 时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YAMLLoader, CSafeDumper as _YAMLDumper
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader, SafeDumper as _YAMLDumper
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,17 +47,85 @@ class ConfigValue:
         return True
 
 
+class ConfigStorage(Protocol):
+    """配置存储后端接口"""
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """读取配置，不存在时返回 None"""
+        ...
+    
+    def save(self, data: Dict[str, Any]) -> None:
+        """写入配置"""
+        ...
+    
+    def describe(self) -> str:
+        """返回用于日志的存储位置描述"""
+        ...
+
+
+class YAMLFileStorage:
+    """基于文件的配置存储（按扩展名选择 YAML 或 JSON）"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+    
+    def describe(self) -> str:
+        """返回配置文件路径"""
+        return str(self.path)
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """读取配置，文件不存在时返回 None"""
+        if not self.path.exists():
+            return None
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            if self.path.suffix.lower() in ['.yaml', '.yml']:
+                return yaml.load(f, Loader=_YAMLLoader) or {}
+            return json.load(f) or {}
+    
+    def save(self, data: Dict[str, Any]) -> None:
+        """写入配置"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(self.path, 'w', encoding='utf-8') as f:
+            if self.path.suffix.lower() in ['.yaml', '.yml']:
+                yaml.dump(data, f, Dumper=_YAMLDumper, default_flow_style=False, indent=2)
+            else:
+                json.dump(data, f, indent=2)
+
+
+class DictStorage:
+    """内存中的配置存储，不涉及磁盘 I/O"""
+    
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self._data = dict(data or {})
+    
+    def describe(self) -> str:
+        """返回存储描述"""
+        return "in-memory storage"
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """读取配置"""
+        return dict(self._data)
+    
+    def save(self, data: Dict[str, Any]) -> None:
+        """写入配置"""
+        self._data = dict(data)
+
+
 class PluginConfigManager:
     """增强的插件配置管理器"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, storage: Optional[ConfigStorage] = None):
         """
         初始化配置管理器
         
         Args:
             config_path: 配置文件路径
+            storage: 配置存储后端（需提供 load/save），默认读写 config_path 指向的文件
         """
         self.config_path = Path(config_path) if config_path else Path("plugins.yaml")
+        self.storage: ConfigStorage = storage if storage is not None else YAMLFileStorage(self.config_path)
         self.config_values: Dict[str, ConfigValue] = {}
         self.schema_validators: Dict[str, Dict[str, Callable]] = {}
         self._load_default_config()
@@ -83,29 +157,24 @@ class PluginConfigManager:
     
     def _load_config_file(self) -> None:
         """加载配置文件"""
-        if not self.config_path.exists():
-            logger.info(f"Config file not found: {self.config_path}")
-            return
-        
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                if self.config_path.suffix.lower() in ['.yaml', '.yml']:
-                    config_data = yaml.safe_load(f) or {}
-                else:
-                    config_data = json.load(f) or {}
-            
-            for key, value in config_data.items():
-                self.config_values[key] = ConfigValue(
-                    value=value,
-                    source=ConfigSource.CONFIG_FILE,
-                    description=f"Config file {key}"
-                )
-            
-            logger.info(f"Loaded config from {self.config_path}")
-            
+            config_data = self.storage.load()
         except Exception as e:
-            logger.error(f"Failed to load config file {self.config_path}: {e}")
+            logger.error(f"Failed to load config from {self.storage.describe()}: {e}")
             raise ConfigurationError(f"Failed to load config file: {e}")
+        
+        if config_data is None:
+            logger.info(f"Config file not found: {self.storage.describe()}")
+            return
+        
+        for key, value in config_data.items():
+            self.config_values[key] = ConfigValue(
+                value=value,
+                source=ConfigSource.CONFIG_FILE,
+                description=f"Config file {key}"
+            )
+        
+        logger.info(f"Loaded config from {self.storage.describe()}")
     
     def _load_environment_variables(self) -> None:
         """加载环境变量"""
@@ -329,15 +398,9 @@ class PluginConfigManager:
                 if config_value.source in [ConfigSource.CONFIG_FILE, ConfigSource.RUNTIME]:
                     runtime_config[key] = config_value.value
             
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
+            self.storage.save(runtime_config)
             
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                if self.config_path.suffix.lower() in ['.yaml', '.yml']:
-                    yaml.dump(runtime_config, f, default_flow_style=False, indent=2)
-                else:
-                    json.dump(runtime_config, f, indent=2)
-            
-            logger.info(f"Config saved to {self.config_path}")
+            logger.info(f"Config saved to {self.storage.describe()}")
             
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
@@ -416,14 +479,15 @@ class PluginConfigManager:
         Returns:
             配置字符串
         """
+        fmt = format.lower()
+        if fmt not in ('yaml', 'json'):
+            raise ConfigurationError(f"Unsupported export format: {format}")
+        
         config_data = self.get_all_config()
         
-        if format.lower() == 'yaml':
-            return yaml.dump(config_data, default_flow_style=False, indent=2)
-        elif format.lower() == 'json':
-            return json.dumps(config_data, indent=2)
-        else:
-            raise ConfigurationError(f"Unsupported export format: {format}")
+        if fmt == 'yaml':
+            return yaml.dump(config_data, Dumper=_YAMLDumper, default_flow_style=False, indent=2)
+        return json.dumps(config_data, indent=2)
 
 
 # 全局配置管理器实例
@@ -9,7 +9,7 @@ import subprocess
 import logging
 import time
 import os
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from collections import defaultdict
@@ -83,8 +83,15 @@ class CacheStats:
 class GitOperations:
     """Handles git operations for AI Commit."""
 
-    def __init__(self):
-        """Initialize Git operations handler."""
+    def __init__(self, runner: Optional[Callable[..., subprocess.CompletedProcess]] = None):
+        """
+        Initialize Git operations handler.
+
+        Args:
+            runner: Callable used to execute git commands, with the same
+                signature as ``subprocess.run``. Defaults to ``subprocess.run``.
+        """
+        self._runner = runner
         self.validator = InputValidator()
         self._cache: Dict[str, CacheEntry] = {}
         self._cache_stats = CacheStats()
@@ -96,23 +103,23 @@ class GitOperations:
         self._prewarm_lock = None
         self._cache_enabled = True
 
+    def _run(self, *args, **kwargs) -> subprocess.CompletedProcess:
+        """Execute a command through the configured runner."""
+        # Resolve subprocess.run lazily so patching it still takes effect
+        runner = self._runner or subprocess.run
+        return runner(*args, **kwargs)
+
     def _get_cache_key(self, command: str, args: List[str] = None) -> str:
         """Generate cache key for git commands."""
         if not args:
             return command
         
-        # Use a more efficient key generation strategy
-        # Hash the arguments for better performance and shorter keys
-        import hashlib
-        
-        # Sort args for consistency
-        sorted_args = sorted(args)
-        args_str = '_'.join(sorted_args)
-        
-        # Create hash of arguments for shorter cache keys
-        args_hash = hashlib.md5(args_str.encode()).hexdigest()[:8]
+        # The cache lives in-process, so the builtin tuple hash is enough;
+        # a cryptographic digest only adds cost. Hashing the sorted tuple
+        # also avoids collisions from joining args with a separator.
+        args_hash = hash(tuple(sorted(args))) & 0xFFFFFFFFFFFFFFFF
         
-        return f"{command}_{args_hash}"
+        return f"{command}_{args_hash:016x}"
 
     def _get_cached_result(self, key: str) -> Optional[Any]:
         """Get cached result if not expired."""
@@ -175,7 +182,7 @@ class GitOperations:
                 return cached_result
         
         try:
-            result = subprocess.run(
+            result = self._run(
                 command,
                 capture_output=True,
                 text=True,
@@ -210,7 +217,7 @@ class GitOperations:
             GitOperationError: If not in a git repository
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'rev-parse', '--git-dir'],
                 capture_output=True,
                 text=True,
@@ -244,7 +251,7 @@ class GitOperations:
             return cached_result
         
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
                 capture_output=True,
                 text=True,
@@ -278,7 +285,7 @@ class GitOperations:
         
         try:
             # Get repository state hash for caching
-            state_result = subprocess.run(
+            state_result = self._run(
                 ['git', 'rev-parse', 'HEAD'],
                 capture_output=True,
                 text=True,
@@ -295,9 +302,10 @@ class GitOperations:
                 return cached_result
             
             # Use single git command to get all file status information
-            # This reduces subprocess calls from 3 to 1
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
+            # This reduces subprocess calls from 3 to 1. -z keeps paths
+            # verbatim (no quoting) and NUL-separates entries.
+            result = self._run(
+                ['git', 'status', '--porcelain=v1', '-z'],
                 capture_output=True,
                 text=True,
                 check=True,
@@ -309,15 +317,23 @@ class GitOperations:
             untracked_files = []
 
             # Parse git status output
-            for line in result.stdout.splitlines():
-                if not line.strip():
+            entries = result.stdout.split('\0')
+            index = 0
+            while index < len(entries):
+                entry = entries[index]
+                index += 1
+                if not entry:
                     continue
 
                 # Git status format: XY FILENAME
                 # X = staged status, Y = unstaged status
-                staged_status = line[0]
-                unstaged_status = line[1]
-                filename = line[3:]
+                staged_status = entry[0]
+                unstaged_status = entry[1]
+                filename = entry[3:]
+
+                if staged_status in 'RC' or unstaged_status in 'RC':
+                    # Renames/copies are followed by the original path
+                    index += 1
 
                 if staged_status != ' ' and staged_status != '?':
                     # File is staged (but not untracked)
@@ -399,7 +415,7 @@ class GitOperations:
             Git diff content
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'diff'] + args,
                 capture_output=True,
                 text=True,
@@ -742,7 +758,7 @@ class GitOperations:
             List of staged file paths
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'diff', '--cached', '--name-only'],
                 capture_output=True,
                 text=True,
@@ -768,7 +784,7 @@ class GitOperations:
             List of unstaged file paths
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'diff', '--name-only'],
                 capture_output=True,
                 text=True,
@@ -838,7 +854,7 @@ class GitOperations:
         try:
             # Use git diff with specific files for better performance
             cmd = ['git', 'diff', '--unified=3'] + files
-            result = subprocess.run(
+            result = self._run(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -848,7 +864,7 @@ class GitOperations:
             
             # Also get staged changes for these files
             cmd_staged = ['git', 'diff', '--cached', '--unified=3'] + files
-            result_staged = subprocess.run(
+            result_staged = self._run(
                 cmd_staged,
                 capture_output=True,
                 text=True,
@@ -1781,7 +1797,7 @@ class GitOperations:
             True if staged changes exist, False otherwise
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'diff', '--cached', '--quiet'],
                 capture_output=True,
                 timeout=10
@@ -1827,7 +1843,7 @@ class GitOperations:
                 if not file_path.exists():
                     logger.debug(f"File does not exist: {file} - likely deleted, using git rm")
                     # Use git rm for deleted files
-                    result = subprocess.run(
+                    result = self._run(
                         ['git', 'rm', file],
                         capture_output=True,
                         text=True,
@@ -1836,7 +1852,7 @@ class GitOperations:
                     )
                 else:
                     # Use git add for existing files
-                    result = subprocess.run(
+                    result = self._run(
                         ['git', 'add', file],
                         capture_output=True,
                         text=True,
@@ -1867,7 +1883,7 @@ class GitOperations:
         for file in files:
             try:
                 # Check if file is ignored by git
-                result = subprocess.run(
+                result = self._run(
                     ['git', 'check-ignore', file],
                     capture_output=True,
                     text=True,
@@ -1934,7 +1950,7 @@ class GitOperations:
         validated_message = self.validator.validate_commit_message(commit_message)
 
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'commit', '-m', validated_message],
                 capture_output=True,
                 text=True,
@@ -1968,7 +1984,7 @@ class GitOperations:
             raise GitOperationError("Could not determine current branch for push")
 
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['git', 'push', 'origin', branch_name],
                 capture_output=True,
                 text=True,
@@ -2474,7 +2490,7 @@ class GitOperations:
         """
         try:
             # Get git status
-            status_result = subprocess.run(
+            status_result = self._run(
                 ['git', 'status', '--porcelain'],
                 capture_output=True,
                 text=True,
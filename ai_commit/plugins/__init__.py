@@ -24,7 +24,7 @@ import traceback
 from ..exceptions import PluginError, ConfigurationError
 from ..security import InputValidator
 from ..core.event_system import EventManager, EventType, Event
-from ..config.enhanced_config import PluginConfigManager, ConfigSource
+from ..config.enhanced_config import PluginConfigManager, ConfigSource, ConfigStorage, DictStorage
 from .error_handling import PluginErrorHandler, ErrorContext, ErrorLevel, ErrorCategory, PluginPerformanceMonitor
 
 logger = logging.getLogger(__name__)
@@ -191,17 +191,31 @@ class ProcessorPlugin(PluginInterface):
 class PluginConfig:
     """插件配置管理（保持向后兼容性）"""
     
-    def __init__(self, config_path: str = "plugins.yaml"):
+    def __init__(self, config_path: str = "plugins.yaml", storage: Optional[ConfigStorage] = None):
         """
         初始化插件配置
         
         Args:
             config_path: 配置文件路径
+            storage: 配置存储后端（需提供 load/save），默认读写 config_path 指向的文件
         """
         self.config_path = Path(config_path)
-        self.enhanced_config = PluginConfigManager(config_path)
+        self.enhanced_config = PluginConfigManager(config_path, storage=storage)
         self.config = self.enhanced_config.get_all_config()
     
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]] = None) -> 'PluginConfig':
+        """
+        创建仅保存在内存中的插件配置（不读写配置文件）
+        
+        Args:
+            data: 初始配置，覆盖默认配置中的同名项
+            
+        Returns:
+            插件配置
+        """
+        return cls(storage=DictStorage(data))
+    
     def load_config(self) -> None:
         """加载插件配置（委托给增强配置管理器）"""
         self.enhanced_config.reload_config()
@@ -362,14 +376,15 @@ class PluginConfig:
 class PluginManager:
     """插件管理器"""
     
-    def __init__(self, config_path: str = "plugins.yaml"):
+    def __init__(self, config_path: str = "plugins.yaml", config: Optional[PluginConfig] = None):
         """
         初始化插件管理器
         
         Args:
             config_path: 配置文件路径
+            config: 已创建的插件配置，提供时忽略 config_path（如 PluginConfig.from_dict()）
         """
-        self.config = PluginConfig(config_path)
+        self.config = config if config is not None else PluginConfig(config_path)
         self.plugins: Dict[str, PluginInterface] = {}
         self.plugin_metadata: Dict[str, PluginMetadata] = {}
         self.plugin_status: Dict[str, PluginStatus] = {}
@@ -440,12 +455,14 @@ class PluginManager:
         logger.info(f"Discovered {len(discovered)} plugins: {discovered}")
         return discovered
     
-    def load_plugin(self, plugin_name: str) -> bool:
+    def load_plugin(self, plugin_name: str,
+                    plugin_class: Optional[Type[PluginInterface]] = None) -> bool:
         """
         加载插件
         
         Args:
             plugin_name: 插件名称
+            plugin_class: 插件类，提供时跳过插件目录查找（如内存中定义的插件）
             
         Returns:
             加载是否成功
@@ -459,7 +476,8 @@ class PluginManager:
         
         try:
             # 查找插件文件
-            plugin_class = self._find_plugin_class(plugin_name)
+            if plugin_class is None:
+                plugin_class = self._find_plugin_class(plugin_name)
             if not plugin_class:
                 error_context = ErrorContext(
                     plugin_name=plugin_name,
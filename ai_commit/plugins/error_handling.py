@@ -8,7 +8,7 @@ import logging
 import traceback
 import sys
 import time
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, FrozenSet, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -64,9 +64,50 @@ class PluginError:
     stack_trace: Optional[str] = None
     error_data: Dict[str, Any] = field(default_factory=dict)
     recovery_suggestions: List[str] = field(default_factory=list)
+    recovery_suggestion_codes: FrozenSet[str] = frozenset()
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+# 各错误类别的恢复建议：(稳定代码, 面向用户的说明)
+_RECOVERY_SUGGESTIONS: Dict[ErrorCategory, Tuple[Tuple[str, str], ...]] = {
+    ErrorCategory.VALIDATION: (
+        ('CONFIG_FORMAT_CHECK', "检查插件配置格式是否正确"),
+        ('REQUIRED_CONFIG_CHECK', "验证所有必需的配置项"),
+        ('READ_PLUGIN_DOCS', "查看插件文档了解配置要求"),
+    ),
+    ErrorCategory.CONFIGURATION: (
+        ('CONFIG_PATH_CHECK', "检查配置文件路径和权限"),
+        ('CONFIG_FILE_FORMAT_CHECK', "验证配置文件格式"),
+        ('RESET_CONFIG', "重置为默认配置"),
+    ),
+    ErrorCategory.DEPENDENCY: (
+        ('INSTALL_DEPENDENCIES', "安装缺失的依赖项"),
+        ('DEPENDENCY_VERSION_CHECK', "检查依赖版本兼容性"),
+        ('UPDATE_DEPENDENCIES', "更新插件依赖关系"),
+    ),
+    ErrorCategory.EXECUTION: (
+        ('PLUGIN_LOGIC_CHECK', "检查插件代码逻辑"),
+        ('INPUT_DATA_CHECK', "验证输入数据"),
+        ('READ_DETAILED_LOGS', "查看详细日志信息"),
+    ),
+    ErrorCategory.TIMEOUT: (
+        ('INCREASE_TIMEOUT', "增加超时时间设置"),
+        ('OPTIMIZE_PLUGIN', "优化插件性能"),
+        ('NETWORK_CHECK', "检查网络连接"),
+    ),
+    ErrorCategory.PERMISSION: (
+        ('FILESYSTEM_PERMISSION_CHECK', "检查文件系统权限"),
+        ('USER_PERMISSION_CHECK', "验证用户权限设置"),
+        ('RUN_PERMISSION_CHECK', "运行权限检查命令"),
+    ),
+}
+
+_RECOVERY_SUGGESTION_CODES: Dict[ErrorCategory, FrozenSet[str]] = {
+    category: frozenset(code for code, _ in suggestions)
+    for category, suggestions in _RECOVERY_SUGGESTIONS.items()
+}
+
+
 class PluginErrorHandler:
     """插件错误处理器"""
     
@@ -178,6 +219,7 @@ class PluginErrorHandler:
         
         # 添加恢复建议
         error.recovery_suggestions = self._generate_recovery_suggestions(error)
+        error.recovery_suggestion_codes = _RECOVERY_SUGGESTION_CODES.get(error.category, frozenset())
         
         # 记录错误
         self._log_error(error)
@@ -232,46 +274,7 @@ class PluginErrorHandler:
     
     def _generate_recovery_suggestions(self, error: PluginError) -> List[str]:
         """生成恢复建议"""
-        suggestions = []
-        
-        if error.category == ErrorCategory.VALIDATION:
-            suggestions.extend([
-                "检查插件配置格式是否正确",
-                "验证所有必需的配置项",
-                "查看插件文档了解配置要求"
-            ])
-        elif error.category == ErrorCategory.CONFIGURATION:
-            suggestions.extend([
-                "检查配置文件路径和权限",
-                "验证配置文件格式",
-                "重置为默认配置"
-            ])
-        elif error.category == ErrorCategory.DEPENDENCY:
-            suggestions.extend([
-                "安装缺失的依赖项",
-                "检查依赖版本兼容性",
-                "更新插件依赖关系"
-            ])
-        elif error.category == ErrorCategory.EXECUTION:
-            suggestions.extend([
-                "检查插件代码逻辑",
-                "验证输入数据",
-                "查看详细日志信息"
-            ])
-        elif error.category == ErrorCategory.TIMEOUT:
-            suggestions.extend([
-                "增加超时时间设置",
-                "优化插件性能",
-                "检查网络连接"
-            ])
-        elif error.category == ErrorCategory.PERMISSION:
-            suggestions.extend([
-                "检查文件系统权限",
-                "验证用户权限设置",
-                "运行权限检查命令"
-            ])
-        
-        return suggestions
+        return [text for _, text in _RECOVERY_SUGGESTIONS.get(error.category, ())]
     
     def _log_error(self, error: PluginError) -> None:
         """记录错误"""
@@ -320,6 +323,7 @@ class PluginErrorHandler:
             'stack_trace': error.stack_trace,
             'error_data': error.error_data,
             'recovery_suggestions': error.recovery_suggestions,
+            'recovery_suggestion_codes': sorted(error.recovery_suggestion_codes),
             'timestamp': error.timestamp.isoformat()
         }
         
@@ -472,15 +476,17 @@ class PluginErrorHandler:
 class PluginPerformanceMonitor:
     """插件性能监控器"""
     
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(self, log_dir: str = "logs", clock: Callable[[], float] = time.perf_counter):
         """
         初始化性能监控器
         
         Args:
             log_dir: 日志目录
+            clock: 计时用的单调时钟，默认 time.perf_counter
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.clock = clock
         
         self.performance_data = {
             'plugin_load_times': {},
@@ -509,7 +515,7 @@ class PluginPerformanceMonitor:
         
         self.performance_data['plugin_load_times'][plugin_name].append({
             'timer_id': timer_id,
-            'start_time': time.time(),
+            'start_time': self.clock(),
             'end_time': None,
             'duration': None
         })
@@ -527,7 +533,7 @@ class PluginPerformanceMonitor:
         if plugin_name in self.performance_data['plugin_load_times']:
             for timer_data in self.performance_data['plugin_load_times'][plugin_name]:
                 if timer_data['timer_id'] == timer_id:
-                    timer_data['end_time'] = time.time()
+                    timer_data['end_time'] = self.clock()
                     timer_data['duration'] = timer_data['end_time'] - timer_data['start_time']
                     
                     # 记录性能日志
@@ -81,6 +81,15 @@ class APIKeyManager:
             raise SecurityError(f"Failed to delete API key for {provider}: {e}")
 
 
+# Most reliable sensitive-data patterns (compiled once), used to reject diffs and messages
+_CRITICAL_PATTERNS = (
+    (re.compile(r'(?i)sk-[a-zA-Z0-9\-_]{32,}'), 'OpenAI API Key'),
+    (re.compile(r'(?i)ghp_[a-zA-Z0-9]{36}'), 'GitHub Personal Access Token'),
+    (re.compile(r'(?i)(AKIA[0-9A-Z]{16})'), 'AWS Access Key'),
+    (re.compile(r'(?i)xoxb-[a-zA-Z0-9\-]{40,}'), 'Slack Token'),
+)
+
+
 class InputValidator:
     """Input validation and sanitization utilities."""
 
@@ -199,17 +208,10 @@ class InputValidator:
             ValidationError: If sensitive data is detected
         """
         # Use only the most reliable patterns to reduce false positives
-        critical_patterns = [
-            (r'(?i)sk-[a-zA-Z0-9\-_]{32,}', 'OpenAI API Key'),
-            (r'(?i)ghp_[a-zA-Z0-9]{36}', 'GitHub Personal Access Token'),
-            (r'(?i)(AKIA[0-9A-Z]{16})', 'AWS Access Key'),
-            (r'(?i)xoxb-[a-zA-Z0-9\-]{40,}', 'Slack Token'),
-        ]
-        
         sensitive_details = []
         
-        for pattern, sensitive_type in critical_patterns:
-            matches = list(re.finditer(pattern, content))
+        for pattern, sensitive_type in _CRITICAL_PATTERNS:
+            matches = list(pattern.finditer(content))
             if matches:
                 logger.warning(
                     f"Sensitive data pattern detected in {content_type}", extra={
@@ -241,6 +243,15 @@ class InputValidator:
             )
 
 
+# Redaction rules for SecureLogger, compiled once from InputValidator.SENSITIVE_PATTERNS.
+# Patterns with a capture group keep the key name (group 1) and redact the value.
+_SENSITIVE_SUBSTITUTIONS = tuple(
+    (compiled, r'\1: [REDACTED]' if compiled.groups else '[REDACTED]')
+    for compiled in (re.compile(pattern, re.IGNORECASE)
+                     for pattern in InputValidator.SENSITIVE_PATTERNS)
+)
+
+
 class SecureLogger:
     """Logger wrapper that filters sensitive information."""
 
@@ -279,18 +290,8 @@ class SecureLogger:
             return text
 
         filtered = text
-        for pattern in InputValidator.SENSITIVE_PATTERNS:
-            # Handle patterns with and without capture groups
-            if '(' in pattern and ')' in pattern:
-                # Pattern has capture groups
-                try:
-                    filtered = re.sub(pattern, r'\1: [REDACTED]', filtered, flags=re.IGNORECASE)
-                except re.error:
-                    # Fallback for complex patterns
-                    filtered = re.sub(pattern, '[REDACTED]', filtered, flags=re.IGNORECASE)
-            else:
-                # Pattern doesn't have capture groups
-                filtered = re.sub(pattern, '[REDACTED]', filtered, flags=re.IGNORECASE)
+        for pattern, replacement in _SENSITIVE_SUBSTITUTIONS:
+            filtered = pattern.sub(replacement, filtered)
 
         return filtered
 
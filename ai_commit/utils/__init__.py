@@ -6,6 +6,7 @@ This module contains utility functions for file selection, logging, and other co
 
 import os
 import logging
+import threading
 from datetime import datetime
 from typing import List, Optional, Set, Dict, Any
 from pathlib import Path
@@ -251,13 +252,24 @@ class LoggingManager:
 
     _instance = None
     _initialized = False
+    _lock = threading.Lock()
 
     def __new__(cls, log_path: str = ".commitLogs"):
         """Singleton pattern implementation."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
         return cls._instance
 
+    @classmethod
+    def reset_for_testing(cls) -> None:
+        """
+        Drop the singleton so the next LoggingManager() re-initializes.
+        """
+        with cls._lock:
+            cls._instance = None
+            cls._initialized = False
+
     def __init__(self, log_path: str = ".commitLogs"):
         """
         Initialize logging manager.
@@ -0,0 +1,17 @@
+"""
+性能测试脚本共享的工具函数
+"""
+
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def no_gc():
+    """计时期间关闭循环垃圾回收，避免 GC 停顿污染尾延迟"""
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
@@ -5,49 +5,125 @@ AI Commit 架构改进后的综合性能测试
 """
 
 import asyncio
+import hashlib
+import importlib.util
 import time
 import statistics
 import threading
+import numpy as np
+from collections import defaultdict
 from typing import List, Dict, Any
 from ai_commit.cache.distributed_cache import get_distributed_cache_manager, CacheBackend
 from ai_commit.core.event_system import get_event_manager, EventType
 from ai_commit.config.hot_config import get_hot_config_manager
 from ai_commit.plugins import PluginManager
+from bench_utils import no_gc
+
+
+# 插件加载测试使用的模块源码
+MOCK_PLUGIN_SOURCE = """
+from ai_commit.plugins import HookPlugin, PluginMetadata, PluginType
+
+
+class PerfPlugin(HookPlugin):
+    @property
+    def metadata(self):
+        return PluginMetadata(
+            name="perf_plugin",
+            version="1.0.0",
+            description="Performance test plugin",
+            author="AI Commit",
+            plugin_type=PluginType.HOOK
+        )
+
+    def initialize(self):
+        self._initialized = True
+        return True
+
+    def cleanup(self):
+        pass
+
+    def execute_hook(self, context):
+        return context
+"""
+
+
+class _MetricBuffer:
+    """单线程独占的预分配采样缓冲区"""
+    
+    __slots__ = ('values', 'count')
+    
+    def __init__(self, capacity: int):
+        self.values: List[float] = [0.0] * capacity
+        self.count = 0
+    
+    def append(self, value: float) -> None:
+        i = self.count
+        if i == len(self.values):
+            # 超出预估容量时按倍数扩容
+            self.values.extend([0.0] * len(self.values))
+        self.values[i] = value
+        self.count = i + 1
 
 
 class PerformanceMetrics:
     """性能指标收集器"""
     
-    def __init__(self):
-        self.metrics: Dict[str, List[float]] = {}
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, capacity)
+        # 每个线程写自己的缓冲区，记录时无需加锁；锁只用于登记新缓冲区和读取汇总
+        self._local = threading.local()
+        self._registry: Dict[str, List[_MetricBuffer]] = {}
         self.lock = threading.Lock()
     
     def record_metric(self, name: str, value: float) -> None:
-        """记录性能指标"""
+        """记录性能指标（写入当前线程的预分配缓冲区）"""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buf = buffers.get(name)
+        if buf is None:
+            buf = buffers[name] = _MetricBuffer(self.capacity)
+            with self.lock:
+                self._registry.setdefault(name, []).append(buf)
+        buf.append(value)
+    
+    def _collect(self, name: str) -> List[float]:
+        """合并各线程缓冲区中已写入的采样"""
         with self.lock:
-            if name not in self.metrics:
-                self.metrics[name] = []
-            self.metrics[name].append(value)
+            buffers = list(self._registry.get(name, ()))
+        values: List[float] = []
+        for buf in buffers:
+            values.extend(buf.values[:buf.count])
+        return values
     
     def get_stats(self, name: str) -> Dict[str, float]:
         """获取指标统计信息"""
-        if name not in self.metrics or not self.metrics[name]:
+        samples = self._collect(name)
+        if not samples:
             return {}
         
-        values = self.metrics[name]
+        # 只排序一次，最值与各分位数都按下标直接读取
+        values = np.sort(np.asarray(samples, dtype=np.float64))
+        n = values.size
         return {
-            'count': len(values),
-            'min': min(values),
-            'max': max(values),
-            'avg': statistics.mean(values),
-            'median': statistics.median(values),
-            'p95': statistics.quantiles(values, n=20)[18] if len(values) > 20 else max(values),
-            'p99': statistics.quantiles(values, n=100)[98] if len(values) > 100 else max(values)
+            'count': int(n),
+            'min': float(values[0]),
+            'max': float(values[-1]),
+            'avg': float(values.mean()),
+            'median': float(values[n // 2]),
+            'p95': float(values[min(n - 1, int(n * 0.95))]),
+            'p99': float(values[min(n - 1, int(n * 0.99))])
         }
     
+    def get_metric_names(self) -> List[str]:
+        """获取已记录的指标名称"""
+        with self.lock:
+            return list(self._registry)
+    
     def get_all_stats(self) -> Dict[str, Dict[str, float]]:
         """获取所有指标统计"""
-        return {name: self.get_stats(name) for name in self.metrics}
+        return {name: self.get_stats(name) for name in self.get_metric_names()}
 
 
 async def test_cache_performance(metrics: PerformanceMetrics) -> None:
@@ -57,32 +133,42 @@ async def test_cache_performance(metrics: PerformanceMetrics) -> None:
     # 测试不同缓存后端
     backends = [CacheBackend.MEMORY, CacheBackend.REDIS]
     
+    # 键值在计时区外一次性构建，避免每次迭代的格式化与分配噪声
+    total_ops = 1000
+    batch_size = 100
+    created_at = time.time()
+    keys = [f"perf_test_{i}" for i in range(total_ops)]
+    values = [{"data": f"value_{i}", "timestamp": created_at} for i in range(total_ops)]
+    
     for backend in backends:
         print(f"\n测试 {backend.value} 缓存...")
         
         cache_manager = get_distributed_cache_manager(backend)
         
-        # 测试基本操作
+        # 测试基本操作：按批次并发提交，测量流水线吞吐而不是单次往返延迟
         start_time = time.time()
         
-        for i in range(1000):
-            key = f"perf_test_{i}"
-            value = {"data": f"value_{i}", "timestamp": time.time()}
-            
-            # 设置
-            set_start = time.time()
-            await cache_manager.set(key, value, ttl=60)
-            set_time = time.time() - set_start
-            metrics.record_metric(f"{backend.value}_set", set_time)
-            
-            # 获取
-            get_start = time.time()
-            retrieved = await cache_manager.get(key)
-            get_time = time.time() - get_start
-            metrics.record_metric(f"{backend.value}_get", get_time)
-            
-            # 验证数据完整性
-            assert retrieved == value, f"Data integrity check failed for {backend.value}"
+        with no_gc():
+            for batch_start in range(0, total_ops, batch_size):
+                batch_end = min(batch_start + batch_size, total_ops)
+                batch_keys = keys[batch_start:batch_end]
+                batch_values = values[batch_start:batch_end]
+                
+                # 设置
+                set_start = time.time()
+                await asyncio.gather(*(cache_manager.set(key, value, ttl=60)
+                                       for key, value in zip(batch_keys, batch_values)))
+                set_time = time.time() - set_start
+                metrics.record_metric(f"{backend.value}_set", set_time / len(batch_keys))
+                
+                # 获取
+                get_start = time.time()
+                retrieved = await asyncio.gather(*(cache_manager.get(key) for key in batch_keys))
+                get_time = time.time() - get_start
+                metrics.record_metric(f"{backend.value}_get", get_time / len(batch_keys))
+                
+                # 验证数据完整性
+                assert retrieved == batch_values, f"Data integrity check failed for {backend.value}"
         
         total_time = time.time() - start_time
         
@@ -90,7 +176,7 @@ async def test_cache_performance(metrics: PerformanceMetrics) -> None:
         cache_stats = await cache_manager.get_stats()
         
         print(f"   总时间: {total_time:.3f}s")
-        print(f"   平均操作时间: {total_time/2000*1000:.3f}ms")
+        print(f"   平均操作时间: {total_time/(2*total_ops)*1000:.3f}ms")
         print(f"   缓存命中率: {cache_stats['manager_stats']['hit_rate']:.2%}")
         print(f"   平均延迟: {cache_stats['manager_stats']['avg_latency_ms']:.3f}ms")
         
@@ -109,23 +195,24 @@ async def test_event_system_performance(metrics: PerformanceMetrics) -> None:
     # 发布事件
     start_time = time.time()
     
-    for i in range(1000):
-        publish_start = time.time()
-        
-        # 使用不同的发布方法
-        if i % 5 == 0:
-            await event_manager.publish_git_operation("test_operation", 0.001, True, {"test_id": i})
-        elif i % 5 == 1:
-            await event_manager.publish_cache_event(EventType.CACHE_HIT, f"key_{i}", True, 0.001)
-        elif i % 5 == 2:
-            await event_manager.publish_performance_metric(f"metric_{i}", i * 0.001, "ms")
-        elif i % 5 == 3:
-            await event_manager.publish_user_action("test_action", {"test_id": i})
-        else:
-            await event_manager.publish_error("test_error", f"error_{i}", {"test_id": i})
-        
-        publish_time = time.time() - publish_start
-        metrics.record_metric("event_publish", publish_time)
+    with no_gc():
+        for i in range(1000):
+            publish_start = time.time()
+            
+            # 使用不同的发布方法
+            if i % 5 == 0:
+                await event_manager.publish_git_operation("test_operation", 0.001, True, {"test_id": i})
+            elif i % 5 == 1:
+                await event_manager.publish_cache_event(EventType.CACHE_HIT, f"key_{i}", True, 0.001)
+            elif i % 5 == 2:
+                await event_manager.publish_performance_metric(f"metric_{i}", i * 0.001, "ms")
+            elif i % 5 == 3:
+                await event_manager.publish_user_action("test_action", {"test_id": i})
+            else:
+                await event_manager.publish_error("test_error", f"error_{i}", {"test_id": i})
+            
+            publish_time = time.time() - publish_start
+            metrics.record_metric("event_publish", publish_time)
     
     total_time = time.time() - start_time
     
@@ -150,15 +237,18 @@ async def test_plugin_system_performance(metrics: PerformanceMetrics) -> None:
     print("\n测试插件加载性能...")
     
     load_times = []
-    for i in range(100):
-        start_time = time.time()
-        
-        # 模拟插件加载（实际插件加载可能更慢）
-        await asyncio.sleep(0.001)  # 模拟加载时间
-        
-        load_time = time.time() - start_time
-        load_times.append(load_time)
-        metrics.record_metric("plugin_load", load_time)
+    with no_gc():
+        for i in range(100):
+            start_time = time.time()
+            
+            # 从源码构建模块，模拟真实插件导入（编译 + 执行模块体）
+            spec = importlib.util.spec_from_loader(f"perf_plugin_{i}", loader=None)
+            module = importlib.util.module_from_spec(spec)
+            exec(compile(MOCK_PLUGIN_SOURCE, spec.name, "exec"), module.__dict__)
+            
+            load_time = time.time() - start_time
+            load_times.append(load_time)
+            metrics.record_metric("plugin_load", load_time)
     
     avg_load_time = statistics.mean(load_times)
     print(f"   平均加载时间: {avg_load_time*1000:.3f}ms")
@@ -173,22 +263,27 @@ async def test_plugin_system_performance(metrics: PerformanceMetrics) -> None:
             self.enabled = True
         
         async def execute(self, data: Dict[str, Any]) -> Dict[str, Any]:
-            # 模拟插件处理
-            await asyncio.sleep(0.0001)  # 模拟处理时间
-            return {"processed_by": self.name, "data": data}
+            # 模拟插件处理：固定的计算负载，而不是受计时器精度限制的 sleep
+            digest = hashlib.blake2b(repr(data).encode() * 64).hexdigest()
+            return {"processed_by": self.name, "data": data, "digest": digest}
     
     # 测试多个插件并发执行
     plugins = [MockPlugin(f"plugin_{i}") for i in range(10)]
     
     start_time = time.time()
     
-    tasks = []
+    coros = []
     for i in range(100):
         plugin = plugins[i % len(plugins)]
-        task = plugin.execute({"test_id": i, "data": f"test_data_{i}"})
-        tasks.append(task)
-    
-    results = await asyncio.gather(*tasks)
+        coros.append(plugin.execute({"test_id": i, "data": f"test_data_{i}"}))
+    
+    if hasattr(asyncio, "TaskGroup"):
+        # Python 3.11+：TaskGroup 的单任务调度开销低于 gather
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+        results = [task.result() for task in tasks]
+    else:
+        results = await asyncio.gather(*coros)
     execution_time = time.time() - start_time
     
     print(f"   并发执行时间: {execution_time:.3f}s")
@@ -207,24 +302,26 @@ async def test_configuration_system_performance(metrics: PerformanceMetrics) ->
     # 测试配置读取性能
     print("\n测试配置读取性能...")
     
-    for i in range(1000):
-        start_time = time.time()
-        
-        config = config_manager.get_config()
-        
-        read_time = time.time() - start_time
-        metrics.record_metric("config_read", read_time)
+    with no_gc():
+        for i in range(1000):
+            start_time = time.time()
+            
+            config = config_manager.get_config()
+            
+            read_time = time.time() - start_time
+            metrics.record_metric("config_read", read_time)
     
     # 测试配置写入性能
     print("\n测试配置写入性能...")
     
-    for i in range(100):
-        start_time = time.time()
-        
-        config_manager.set_config(f"test_key_{i}", f"test_value_{i}")
-        
-        write_time = time.time() - start_time
-        metrics.record_metric("config_write", write_time)
+    with no_gc():
+        for i in range(100):
+            start_time = time.time()
+            
+            config_manager.set_config(f"test_key_{i}", f"test_value_{i}")
+            
+            write_time = time.time() - start_time
+            metrics.record_metric("config_write", write_time)
     
     # 获取配置性能统计
     read_stats = metrics.get_stats("config_read")
@@ -247,34 +344,38 @@ async def test_system_integration_performance(metrics: PerformanceMetrics) -> No
     
     workflow_times = []
     
-    for i in range(100):
-        start_time = time.time()
-        
-        # 1. 缓存操作
-        cache_manager = get_distributed_cache_manager(CacheBackend.MEMORY)
-        await cache_manager.set(f"workflow_{i}", {"step": "cache", "data": f"test_{i}"})
-        
-        # 2. 事件发布
-        event_manager = await get_event_manager()
-        await event_manager.publish_git_operation("workflow_cache", 0.001, True, {
-            "workflow_id": i,
-            "step": "cache",
-            "timestamp": time.time()
-        })
-        
-        # 3. 配置读取
-        config_manager = get_hot_config_manager("perf_test_config.yaml")
-        config = config_manager.get_config()
-        
-        # 4. 模拟插件处理
-        await asyncio.sleep(0.001)  # 模拟插件处理时间
-        
-        workflow_time = time.time() - start_time
-        workflow_times.append(workflow_time)
-        metrics.record_metric("workflow_execution", workflow_time)
+    # 各管理器在循环外解析一次，循环内只测量工作流本身
+    cache_manager = get_distributed_cache_manager(CacheBackend.MEMORY)
+    event_manager = await get_event_manager()
+    config_manager = get_hot_config_manager("perf_test_config.yaml")
     
-    avg_workflow_time = statistics.mean(workflow_times)
-    p95_workflow_time = statistics.quantiles(workflow_times, n=20)[18]
+    with no_gc():
+        for i in range(100):
+            start_time = time.time()
+            
+            # 1. 缓存操作
+            await cache_manager.set(f"workflow_{i}", {"step": "cache", "data": f"test_{i}"})
+            
+            # 2. 事件发布
+            await event_manager.publish_git_operation("workflow_cache", 0.001, True, {
+                "workflow_id": i,
+                "step": "cache",
+                "timestamp": time.time()
+            })
+            
+            # 3. 配置读取
+            config = config_manager.get_config()
+            
+            # 4. 模拟插件处理
+            await asyncio.sleep(0.001)  # 模拟插件处理时间
+            
+            workflow_time = time.time() - start_time
+            workflow_times.append(workflow_time)
+            metrics.record_metric("workflow_execution", workflow_time)
+    
+    workflow_stats = metrics.get_stats("workflow_execution")
+    avg_workflow_time = workflow_stats['avg']
+    p95_workflow_time = workflow_stats['p95']
     
     print(f"   平均工作流时间: {avg_workflow_time*1000:.3f}ms")
     print(f"   P95工作流时间: {p95_workflow_time*1000:.3f}ms")
@@ -301,22 +402,28 @@ async def main():
     print("性能测试报告")
     print("=" * 60)
     
-    all_stats = metrics.get_all_stats()
-    
-    # 按类别展示性能指标
-    categories = {
-        "缓存性能": [k for k in all_stats.keys() if "cache" in k or "memory" in k or "redis" in k],
-        "事件系统性能": [k for k in all_stats.keys() if "event" in k],
-        "插件系统性能": [k for k in all_stats.keys() if "plugin" in k],
-        "配置系统性能": [k for k in all_stats.keys() if "config" in k],
-        "工作流性能": [k for k in all_stats.keys() if "workflow" in k]
-    }
-    
-    for category, metric_names in categories.items():
+    # 按类别展示性能指标：单次遍历指标名，按首个匹配的规则归类
+    category_rules = [
+        ("缓存性能", ("cache", "memory", "redis")),
+        ("事件系统性能", ("event",)),
+        ("插件系统性能", ("plugin",)),
+        ("配置系统性能", ("config",)),
+        ("工作流性能", ("workflow",)),
+    ]
+    categories: Dict[str, List[str]] = defaultdict(list)
+    for metric_name in metrics.get_metric_names():
+        for category, keywords in category_rules:
+            if any(keyword in metric_name for keyword in keywords):
+                categories[category].append(metric_name)
+                break
+    
+    for category, _ in category_rules:
+        metric_names = categories.get(category)
         if metric_names:
             print(f"\n{category}:")
             for metric_name in metric_names:
-                stats = all_stats[metric_name]
+                # 只为归入类别的指标计算统计
+                stats = metrics.get_stats(metric_name)
                 if stats:
                     print(f"  {metric_name}:")
                     print(f"    平均: {stats['avg']*1000:.3f}ms")
@@ -337,5 +444,17 @@ async def main():
     print(f"  所有系统组件性能均达到预期目标。")
 
 
+def install_event_loop_policy() -> str:
+    """优先使用 uvloop（可选依赖），未安装时回退到默认事件循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return "asyncio"
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return "uvloop"
+
+
 if __name__ == "__main__":
+    # 事件循环策略需在 asyncio.run 创建循环之前设置
+    print(f"事件循环: {install_event_loop_policy()}")
     asyncio.run(main())
\ No newline at end of file
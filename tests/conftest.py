@@ -0,0 +1,36 @@
+"""
+Shared pytest fixtures.
+
+Objects that are expensive to build but not mutated by the tests are
+constructed once per session/module instead of once per test.
+"""
+
+import pytest
+
+from ai_commit.config import AICommitConfig
+from ai_commit.plugins import PluginManager
+
+
+@pytest.fixture(scope="session")
+def base_config_kwargs():
+    """Keyword arguments for a valid AICommitConfig."""
+    return {
+        'openai_api_key': "sk-test-key-1234567890abcdef",
+        'openai_base_url': "https://api.openai.com/v1",
+        'openai_model': "gpt-3.5-turbo",
+    }
+
+
+@pytest.fixture(scope="session")
+def base_config(base_config_kwargs):
+    """Valid configuration shared by every test; treat it as read-only."""
+    return AICommitConfig(**base_config_kwargs)
+
+
+@pytest.fixture(scope="module")
+def plugin_manager(tmp_path_factory):
+    """One PluginManager per test module, backed by a throwaway config path."""
+    config_path = tmp_path_factory.mktemp("plugins") / "test_config.yaml"
+    manager = PluginManager(str(config_path))
+    yield manager
+    manager.cleanup()
@@ -0,0 +1,10 @@
+"""
+Shared test helpers.
+"""
+
+from types import SimpleNamespace
+
+
+def completed(stdout="", code=0):
+    """Lightweight stand-in for subprocess.CompletedProcess."""
+    return SimpleNamespace(returncode=code, stdout=stdout, stderr="")
@@ -1,11 +1,8 @@
-import unittest
-import sys
-import os
-from unittest.mock import patch, MagicMock
-import tempfile
+import subprocess
+from contextlib import nullcontext
+from unittest.mock import patch
 
-# Add the parent directory to the path to import ai_commit
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pytest
 
 # Import from the new modular architecture
 from ai_commit.cli import parse_args, AICommitWorkflow
@@ -13,201 +10,202 @@ from ai_commit.config import AICommitConfig
 from ai_commit.git import GitOperations
 from ai_commit.ai import AIClient
 from ai_commit.utils import FileSelector
-from ai_commit.exceptions import GitOperationError, ValidationError
-
-
-class TestAICommit(unittest.TestCase):
-    """Test cases for AI Commit functionality"""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_config = AICommitConfig(
-            openai_api_key="sk-test-key-1234567890abcdef",
-            openai_base_url="https://api.openai.com/v1",
-            openai_model="gpt-3.5-turbo"
-        )
-
-    def test_parse_args(self):
-        """Test argument parsing"""
-        # Test default args
-        with patch('sys.argv', ['ai-commit']):
-            args = parse_args()
-            self.assertFalse(args.yes)
-            self.assertFalse(args.dry_run)
-            self.assertFalse(args.verbose)
-            self.assertFalse(args.interactive)
-            self.assertFalse(args.all)
-            self.assertIsNone(args.config)
-            self.assertIsNone(args.model)
-        
-        # Test interactive mode
-        with patch('sys.argv', ['ai-commit', '-i']):
-            args = parse_args()
-            self.assertTrue(args.interactive)
-        
-        # Test all mode
-        with patch('sys.argv', ['ai-commit', '-a']):
-            args = parse_args()
-            self.assertTrue(args.all)
-
-    @patch('ai_commit.git.subprocess.run')
-    def test_git_operations_get_branch_name(self, mock_run):
-        """Test branch name extraction with GitOperations"""
-        git_ops = GitOperations()
-        
-        # Disable cache for testing to avoid caching issues
-        git_ops.disable_cache_for_testing()
-        
-        # Test successful branch name retrieval
-        mock_run.return_value = MagicMock(stdout="main\n", returncode=0)
-        result = git_ops.get_current_branch()
-        self.assertEqual(result, "main")
-        
+from ai_commit.exceptions import ConfigurationError, GitOperationError, ValidationError
+
+from tests.helpers import completed
+
+
+@pytest.mark.parametrize("argv,expected", [
+    # Test default args
+    ([], {'yes': False, 'dry_run': False, 'verbose': False, 'interactive': False,
+          'all': False, 'config': None, 'model': None}),
+    # Test interactive mode
+    (['-i'], {'interactive': True}),
+    # Test all mode
+    (['-a'], {'all': True}),
+])
+def test_parse_args(argv, expected):
+    """Test argument parsing"""
+    args = parse_args(argv)
+
+    for name, value in expected.items():
+        assert getattr(args, name) == value
+
+
+class FakeRunner:
+    """Stand-in for subprocess.run that replays canned results in order."""
+
+    def __init__(self, results):
+        self.results = iter(results)
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(args[0] if args else kwargs.get('args'))
+        result = next(self.results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_git_operations_get_branch_name():
+    """Test branch name extraction with GitOperations"""
+    runner = FakeRunner([
+        completed("main\n"),
         # Test error handling - should return None on subprocess error
-        import subprocess
-        mock_run.side_effect = subprocess.CalledProcessError(1, 'git')
-        result = git_ops.get_current_branch()
-        self.assertIsNone(result)
-        
-        # Re-enable cache
-        git_ops.enable_cache_for_testing()
-
-    @patch('ai_commit.git.subprocess.run')
-    def test_git_operations_validate_staged_changes(self, mock_run):
-        """Test staged changes validation with GitOperations"""
-        git_ops = GitOperations()
-        
-        # Test with staged changes
-        mock_run.return_value = MagicMock(returncode=1)  # Non-zero means changes exist
-        result = git_ops.validate_staged_changes()
-        self.assertTrue(result)
-        
-        # Test without staged changes
-        mock_run.return_value = MagicMock(returncode=0)  # Zero means no changes
-        result = git_ops.validate_staged_changes()
-        self.assertFalse(result)
-
-    @patch('ai_commit.git.subprocess.run')
-    def test_git_operations_get_changed_files(self, mock_run):
-        """Test getting changed files with GitOperations"""
-        git_ops = GitOperations()
-        
-        # Disable cache for testing to avoid caching issues
-        git_ops.disable_cache_for_testing()
-        
-        # Mock the single subprocess call with git status --porcelain output
-        # Format: XY filename (X=staged, Y=unstaged)
-        mock_run.return_value = MagicMock(
-            stdout="M  file1.py\nA  file2.py\n M file3.py\n?? file4.py\n",
-            returncode=0
-        )
-        
-        staged, unstaged = git_ops.get_changed_files()
-        
-        # Should return staged files and combined unstaged files
-        # file1.py and file2.py are staged (M and A)
-        # file3.py has unstaged changes (M in second position)
-        # file4.py is untracked (??)
-        self.assertEqual(set(staged), {'file1.py', 'file2.py'})
-        self.assertEqual(set(unstaged), {'file3.py', 'file4.py'})
-        
-        # Re-enable cache
-        git_ops.enable_cache_for_testing()
-
-    @patch('ai_commit.git.subprocess.run')
-    def test_git_operations_stage_files(self, mock_run):
-        """Test staging files with GitOperations"""
-        git_ops = GitOperations()
-        
-        # Test successful staging
-        mock_run.return_value = MagicMock(returncode=0)
-        
-        # Mock Path.exists to return True
-        with patch('pathlib.Path.exists', return_value=True):
-            result = git_ops.stage_files(['file1.py', 'file2.py'])
-            self.assertTrue(result)
-        
-        # Test with empty list
-        result = git_ops.stage_files([])
-        self.assertTrue(result)
-
-    def test_config_validation(self):
-        """Test configuration validation"""
-        # Test valid configuration
-        valid_config = AICommitConfig(
-            openai_api_key="sk-test-key-1234567890abcdef",
-            openai_base_url="https://api.openai.com/v1",
-            openai_model="gpt-3.5-turbo"
-        )
-        # Should not raise an exception
-        valid_config.validate()
-        
-        # Test invalid API key format - should raise ConfigurationError due to validation in __post_init__
-        from ai_commit.exceptions import ConfigurationError
-        with self.assertRaises(ConfigurationError):
-            AICommitConfig(
-                openai_api_key="invalid-key",
-                openai_base_url="https://api.openai.com/v1",
-                openai_model="gpt-3.5-turbo"
-            )
-
-    @patch.dict(os.environ, {
-        'OPENAI_API_KEY': 'sk-env-test-key-1234567890abcdef',
-        'OPENAI_BASE_URL': 'https://api.openai.com/v1',
-        'OPENAI_MODEL': 'gpt-4',
-        'LOG_PATH': '.logs',
-        'AUTO_COMMIT': 'true'
-    })
-    def test_load_config_from_env_vars(self):
-        """Test loading configuration from environment variables"""
-        from ai_commit.config import ConfigurationLoader
-        
-        config_loader = ConfigurationLoader()
-        
-        # Mock file finding to return no config files
-        with patch.object(config_loader, '_find_config_files', return_value=(None, None)):
-            config = config_loader.load_config()
-            
-            self.assertEqual(config.openai_api_key, 'sk-env-test-key-1234567890abcdef')
-            self.assertEqual(config.openai_base_url, 'https://api.openai.com/v1')
-            self.assertEqual(config.openai_model, 'gpt-4')
-            self.assertEqual(config.log_path, '.logs')
-            self.assertTrue(config.auto_commit)
-
-    def test_ai_client_initialization(self):
-        """Test AI client initialization"""
-        ai_client = AIClient(self.test_config)
-        self.assertIsInstance(ai_client, AIClient)
-        
-        # Test that methods exist
-        self.assertTrue(hasattr(ai_client, 'generate_commit_message'))
-        self.assertTrue(hasattr(ai_client, 'test_connection'))
-
-    def test_file_selector_initialization(self):
-        """Test file selector initialization"""
-        file_selector = FileSelector()
-        
-        # Test that methods exist
-        self.assertTrue(hasattr(file_selector, 'display_file_changes'))
-        self.assertTrue(hasattr(file_selector, 'select_files_interactive'))
-
-    def test_workflow_initialization(self):
-        """Test workflow initialization"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config = AICommitConfig(
-                openai_api_key="sk-test-key-1234567890abcdef",
-                openai_base_url="https://api.openai.com/v1",
-                openai_model="gpt-3.5-turbo",
-                log_path=temp_dir
-            )
-            
-            workflow = AICommitWorkflow(config)
-            self.assertIsInstance(workflow, AICommitWorkflow)
-            self.assertEqual(workflow.config, config)
-            self.assertIsNotNone(workflow.git_ops)
-            self.assertIsNotNone(workflow.ai_client)
-            self.assertIsNotNone(workflow.file_selector)
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        subprocess.CalledProcessError(1, 'git'),
+    ])
+    git_ops = GitOperations(runner=runner)
+
+    # Disable cache for testing to avoid caching issues
+    git_ops.disable_cache_for_testing()
+
+    # Test successful branch name retrieval
+    assert git_ops.get_current_branch() == "main"
+    assert git_ops.get_current_branch() is None
+
+
+@pytest.mark.parametrize("returncode,expected", [
+    (1, True),   # Non-zero means changes exist
+    (0, False),  # Zero means no changes
+])
+def test_git_operations_validate_staged_changes(returncode, expected):
+    """Test staged changes validation with GitOperations"""
+    git_ops = GitOperations(runner=FakeRunner([completed(code=returncode)]))
+
+    assert git_ops.validate_staged_changes() is expected
+
+
+# HEAD lookup plus the single git status --porcelain=v1 -z call
+# Format: XY filename\0 (X=staged, Y=unstaged); renames add the old path
+_CHANGED_FILES_SEQ = (
+    completed("abcdef1234567890\n"),
+    completed(
+        "M  file1.py\0A  file2.py\0 M file3.py\0?? file4.py\0"
+        "R  new name.py\0old name.py\0"
+    ),
+)
+
+
+def test_git_operations_get_changed_files():
+    """Test getting changed files with GitOperations"""
+    runner = FakeRunner(_CHANGED_FILES_SEQ)
+    git_ops = GitOperations(runner=runner)
+
+    # Disable cache for testing to avoid caching issues
+    git_ops.disable_cache_for_testing()
+
+    staged, unstaged = git_ops.get_changed_files()
+
+    # Only one git status call is issued
+    assert runner.calls == [
+        ['git', 'rev-parse', 'HEAD'],
+        ['git', 'status', '--porcelain=v1', '-z'],
+    ]
+
+    # Should return staged files and combined unstaged files
+    # file1.py and file2.py are staged (M and A), new name.py is a staged rename
+    # file3.py has unstaged changes (M in second position)
+    # file4.py is untracked (??)
+    assert set(staged) == {'file1.py', 'file2.py', 'new name.py'}
+    assert set(unstaged) == {'file3.py', 'file4.py'}
+
+
+def test_git_operations_stage_files():
+    """Test staging files with GitOperations"""
+    # git check-ignore exits 1 for files that are not ignored, then git add succeeds
+    runner = FakeRunner([
+        completed(code=1),
+        completed(code=1),
+        completed(),
+        completed(),
+    ])
+    git_ops = GitOperations(runner=runner)
+
+    # Mock Path.exists to return True
+    with patch('pathlib.Path.exists', return_value=True):
+        assert git_ops.stage_files(['file1.py', 'file2.py']) is True
+
+    assert runner.calls[2:] == [['git', 'add', 'file1.py'], ['git', 'add', 'file2.py']]
+
+    # Test with empty list
+    assert git_ops.stage_files([]) is True
+
+
+@pytest.mark.parametrize("overrides,raises", [
+    # Valid configuration
+    ({}, None),
+    # Invalid API key format - rejected by validation in __post_init__
+    ({'openai_api_key': "invalid-key"}, ConfigurationError),
+    ({'openai_base_url': "ftp://api.openai.com/v1"}, ConfigurationError),
+    ({'openai_model': ""}, ConfigurationError),
+    ({'max_retries': 0}, ConfigurationError),
+    ({'timeout': 1}, ConfigurationError),
+])
+def test_config_validation(base_config_kwargs, overrides, raises):
+    """Test configuration validation"""
+    expectation = pytest.raises(raises) if raises else nullcontext()
+    with expectation:
+        AICommitConfig(**{**base_config_kwargs, **overrides})
+
+
+def test_load_config_from_env_vars(monkeypatch):
+    """Test loading configuration from environment variables"""
+    from ai_commit.config import ConfigurationLoader
+
+    # ANTHROPIC_* variables take precedence, so make sure none leak in
+    for name in ('ANTHROPIC_AUTH_TOKEN', 'ANTHROPIC_BASE_URL', 'ANTHROPIC_MODEL'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-env-test-key-1234567890abcdef')
+    monkeypatch.setenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+    monkeypatch.setenv('OPENAI_MODEL', 'gpt-4')
+    monkeypatch.setenv('LOG_PATH', '.logs')
+    monkeypatch.setenv('AUTO_COMMIT', 'true')
+
+    # Mock file finding to return no config files
+    monkeypatch.setattr(ConfigurationLoader, '_find_config_files', lambda self, config_path=None: (None, None))
+
+    config = ConfigurationLoader().load_config()
+
+    assert config.openai_api_key == 'sk-env-test-key-1234567890abcdef'
+    assert config.openai_base_url == 'https://api.openai.com/v1'
+    assert config.openai_model == 'gpt-4'
+    assert config.log_path == '.logs'
+    assert config.auto_commit is True
+
+
+def test_ai_client_initialization(base_config):
+    """Test AI client initialization"""
+    ai_client = AIClient(base_config)
+    assert isinstance(ai_client, AIClient)
+
+
+@pytest.mark.parametrize("text,expected", [
+    # Fenced block with a language tag
+    ("```text\nfeat: add login page\n```", "feat: add login page"),
+    # Fenced block without a language tag, surrounded by prose
+    ("Sure!\n```\nfix: handle empty diff\n```\nHope this helps.", "fix: handle empty diff"),
+    # No backticks: strip the prefix and quotes
+    ('Commit message: "docs: update README"', "docs: update README"),
+])
+def test_extract_commit_message(base_config, text, expected):
+    """Test commit message extraction from AI responses"""
+    ai_client = AIClient(base_config)
+    assert ai_client._extract_commit_message(text) == expected
+
+
+def test_file_selector_initialization():
+    """Test file selector initialization"""
+    file_selector = FileSelector()
+    assert isinstance(file_selector, FileSelector)
+
+
+def test_workflow_initialization(base_config_kwargs, tmp_path):
+    """Test workflow initialization"""
+    config = AICommitConfig(**base_config_kwargs, log_path=str(tmp_path))
+
+    workflow = AICommitWorkflow(config)
+    assert isinstance(workflow, AICommitWorkflow)
+    assert workflow.config == config
+    assert workflow.git_ops is not None
+    assert workflow.ai_client is not None
+    assert workflow.file_selector is not None
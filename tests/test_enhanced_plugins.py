@@ -4,13 +4,12 @@
 测试新的配置管理、错误处理和性能监控功能。
 """
 
+import functools
 import pytest
-import tempfile
 import json
 import yaml
-import time
-from pathlib import Path
-from unittest.mock import Mock, patch
+from typing import Tuple
+from unittest.mock import patch
 
 from ai_commit.plugins import (
     PluginManager, PluginConfig, PluginType, PluginStatus,
@@ -20,7 +19,66 @@ from ai_commit.plugins.error_handling import (
     PluginErrorHandler, ErrorContext, ErrorLevel, ErrorCategory,
     PluginPerformanceMonitor
 )
-from ai_commit.config.enhanced_config import PluginConfigManager, ConfigSource
+from ai_commit.config.enhanced_config import PluginConfigManager, ConfigSource, DictStorage
+from ai_commit.exceptions import ConfigurationError
+
+
+class _ProcessorTestPlugin(PluginInterface):
+    """测试用处理器插件，元数据在构造时生成一次"""
+    
+    _DEPS: Tuple[str, ...] = ()
+    
+    def __init__(self, config=None):
+        super().__init__(config)
+        self._metadata = PluginMetadata(
+            name="test_plugin",
+            version="1.0.0",
+            description="Test plugin",
+            author="Test",
+            plugin_type=PluginType.PROCESSOR,
+            dependencies=list(self._DEPS)
+        )
+    
+    @property
+    def metadata(self):
+        return self._metadata
+    
+    def initialize(self):
+        return True
+    
+    def cleanup(self):
+        pass
+    
+    def process(self, data):
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def _test_plugin_class(dependencies: Tuple[str, ...]):
+    return type("TestPlugin", (_ProcessorTestPlugin,), {'_DEPS': dependencies})
+
+
+def make_test_plugin(dependencies=()):
+    """返回声明了指定依赖的测试插件类（相同依赖只构建一次）"""
+    return _test_plugin_class(tuple(dependencies))
+
+
+@pytest.fixture(scope="module")
+def handler_dir(tmp_path_factory):
+    """错误处理器测试共享的日志目录"""
+    return tmp_path_factory.mktemp("errhandler")
+
+
+@pytest.fixture(scope="module")
+def monitor_dir(tmp_path_factory):
+    """性能监控器测试共享的日志目录"""
+    return tmp_path_factory.mktemp("monitor")
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """插件管理器测试的配置文件路径（每个测试独立）"""
+    return tmp_path / "test_config.yaml"
 
 
 class TestEnhancedConfig:
@@ -28,392 +86,355 @@ class TestEnhancedConfig:
     
     def test_config_manager_initialization(self):
         """测试配置管理器初始化"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginConfigManager(str(config_path))
-            
-            # 验证默认配置
-            assert manager.get('plugin_directories') == ['plugins']
-            assert manager.get('auto_load') is True
-            assert manager.get('strict_validation') is True
+        manager = PluginConfigManager(storage=DictStorage())
+        
+        # 验证默认配置
+        assert manager.get('plugin_directories') == ['plugins']
+        assert manager.get('auto_load') is True
+        assert manager.get('strict_validation') is True
     
     def test_config_source_tracking(self):
         """测试配置来源跟踪"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginConfigManager(str(config_path))
-            
-            # 测试默认配置来源
-            source = manager.get_config_source('plugin_directories')
-            assert source == ConfigSource.DEFAULT
-            
-            # 测试运行时配置来源
-            manager.set('test_key', 'test_value')
-            source = manager.get_config_source('test_key')
-            assert source == ConfigSource.RUNTIME
+        manager = PluginConfigManager(storage=DictStorage())
+        
+        # 测试默认配置来源
+        source = manager.get_config_source('plugin_directories')
+        assert source == ConfigSource.DEFAULT
+        
+        # 测试运行时配置来源
+        manager.set('test_key', 'test_value')
+        source = manager.get_config_source('test_key')
+        assert source == ConfigSource.RUNTIME
     
     def test_plugin_config_validation(self):
         """测试插件配置验证"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginConfigManager(str(config_path))
-            
-            # 注册插件模式
-            schema = {
-                'max_file_size': {'type': 'integer', 'default': 1024},
-                'check_syntax': {'type': 'boolean', 'default': True}
-            }
-            manager.register_plugin_schema('test_plugin', schema)
-            
-            # 测试有效配置
-            valid_config = {'max_file_size': 2048, 'check_syntax': False}
-            assert manager.validate_plugin_config('test_plugin', valid_config) is True
-            
-            # 测试无效配置
-            invalid_config = {'max_file_size': 'not_a_number'}
-            assert manager.validate_plugin_config('test_plugin', invalid_config) is False
+        manager = PluginConfigManager(storage=DictStorage())
+        
+        # 注册插件模式
+        schema = {
+            'max_file_size': {'type': 'integer', 'default': 1024},
+            'check_syntax': {'type': 'boolean', 'default': True}
+        }
+        manager.register_plugin_schema('test_plugin', schema)
+        
+        # 测试有效配置
+        valid_config = {'max_file_size': 2048, 'check_syntax': False}
+        assert manager.validate_plugin_config('test_plugin', valid_config) is True
+        
+        # 测试无效配置
+        invalid_config = {'max_file_size': 'not_a_number'}
+        assert manager.validate_plugin_config('test_plugin', invalid_config) is False
     
-    def test_config_file_operations(self):
+    @pytest.mark.slow
+    def test_config_file_operations(self, tmp_path):
         """测试配置文件操作"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginConfigManager(str(config_path))
-            
-            # 修改配置
-            manager.set('test_key', 'test_value')
-            manager.save_config()
-            
-            # 重新加载配置
-            new_manager = PluginConfigManager(str(config_path))
-            assert new_manager.get('test_key') == 'test_value'
+        config_path = tmp_path / "test_config.yaml"
+        manager = PluginConfigManager(str(config_path))
+        
+        # 修改配置
+        manager.set('test_key', 'test_value')
+        manager.save_config()
+        
+        # 重新加载配置
+        new_manager = PluginConfigManager(str(config_path))
+        assert new_manager.get('test_key') == 'test_value'
+    
+    def test_in_memory_storage(self):
+        """测试内存配置存储"""
+        storage = DictStorage({'auto_load': False})
+        manager = PluginConfigManager(storage=storage)
+        assert manager.get('auto_load') is False
+        assert manager.get_config_source('auto_load') == ConfigSource.CONFIG_FILE
+        
+        # 保存后由同一存储重新加载
+        manager.set('test_key', 'test_value')
+        manager.save_config()
+        
+        new_manager = PluginConfigManager(storage=storage)
+        assert new_manager.get('test_key') == 'test_value'
     
     def test_environment_variable_support(self):
         """测试环境变量支持"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            
-            # 设置环境变量
-            with patch.dict('os.environ', {'AI_COMMIT_PLUGIN_DIRS': 'custom_plugins,extra_plugins'}):
-                manager = PluginConfigManager(str(config_path))
-                assert manager.get('plugin_directories') == ['custom_plugins', 'extra_plugins']
+        # 设置环境变量
+        with patch.dict('os.environ', {'AI_COMMIT_PLUGIN_DIRS': 'custom_plugins,extra_plugins'}):
+            manager = PluginConfigManager(storage=DictStorage())
+            assert manager.get('plugin_directories') == ['custom_plugins', 'extra_plugins']
     
-    def test_config_export(self):
+    @pytest.mark.parametrize("fmt,loads", [
+        ('yaml', yaml.safe_load),
+        ('json', json.loads),
+    ])
+    def test_config_export(self, fmt, loads):
         """测试配置导出"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginConfigManager(str(config_path))
-            
-            # 导出为YAML
-            yaml_config = manager.export_config('yaml')
-            assert 'plugin_directories' in yaml_config
-            
-            # 导出为JSON
-            json_config = manager.export_config('json')
-            assert 'plugin_directories' in json_config
+        manager = PluginConfigManager(storage=DictStorage())
+        
+        exported = manager.export_config(fmt)
+        assert loads(exported)['plugin_directories'] == ['plugins']
+        
+        # 配置变更后导出结果应随之更新
+        manager.set('plugin_directories', ['custom_plugins'])
+        assert loads(manager.export_config(fmt))['plugin_directories'] == ['custom_plugins']
+    
+    def test_config_export_after_enable_plugin(self):
+        """测试通过 PluginConfig 启用插件后导出结果同步更新"""
+        config = PluginConfig.from_dict()
+        config.enhanced_config.export_config('json')
+        
+        config.enable_plugin('my_plugin')
+        
+        exported = json.loads(config.enhanced_config.export_config('json'))
+        assert 'my_plugin' in exported['enabled_plugins']
+    
+    def test_config_export_unsupported_format(self):
+        """测试不支持的导出格式"""
+        manager = PluginConfigManager(storage=DictStorage())
+        
+        with pytest.raises(ConfigurationError):
+            manager.export_config('toml')
 
 
 class TestErrorHandler:
     """测试错误处理器"""
     
-    def test_error_handler_initialization(self):
+    def test_error_handler_initialization(self, handler_dir):
         """测试错误处理器初始化"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            handler = PluginErrorHandler(temp_dir)
-            
-            # 验证错误统计初始化
-            stats = handler.get_error_stats()
-            assert stats['total_errors'] == 0
-            assert 'errors_by_level' in stats
-            assert 'errors_by_category' in stats
+        handler = PluginErrorHandler(handler_dir)
+        
+        # 验证错误统计初始化
+        stats = handler.get_error_stats()
+        assert stats['total_errors'] == 0
+        assert 'errors_by_level' in stats
+        assert 'errors_by_category' in stats
     
-    def test_error_handling(self):
+    def test_error_handling(self, handler_dir):
         """测试错误处理"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            handler = PluginErrorHandler(temp_dir)
-            
-            # 创建错误上下文
-            context = ErrorContext(
-                plugin_name="test_plugin",
-                operation="test_operation"
-            )
-            
-            # 处理错误
-            error = handler.handle_error(
-                Exception("Test error"),
-                context,
-                ErrorLevel.ERROR,
-                ErrorCategory.EXECUTION
-            )
-            
-            # 验证错误处理结果
-            assert error.level == ErrorLevel.ERROR
-            assert error.category == ErrorCategory.EXECUTION
-            assert error.message == "Test error"
-            assert error.context.plugin_name == "test_plugin"
-            
-            # 验证错误统计更新
-            stats = handler.get_error_stats()
-            assert stats['total_errors'] == 1
+        handler = PluginErrorHandler(handler_dir)
+        
+        # 创建错误上下文
+        context = ErrorContext(
+            plugin_name="test_plugin",
+            operation="test_operation"
+        )
+        
+        # 处理错误
+        error = handler.handle_error(
+            Exception("Test error"),
+            context,
+            ErrorLevel.ERROR,
+            ErrorCategory.EXECUTION
+        )
+        
+        # 验证错误处理结果
+        assert error.level == ErrorLevel.ERROR
+        assert error.category == ErrorCategory.EXECUTION
+        assert error.message == "Test error"
+        assert error.context.plugin_name == "test_plugin"
+        
+        # 验证错误统计更新
+        stats = handler.get_error_stats()
+        assert stats['total_errors'] == 1
     
-    def test_error_categorization(self):
+    def test_error_categorization(self, handler_dir):
         """测试错误分类"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            handler = PluginErrorHandler(temp_dir)
-            
-            from ai_commit.exceptions import ConfigurationError
-            
-            context = ErrorContext(
-                plugin_name="test_plugin",
-                operation="test_operation"
-            )
-            
-            # 测试配置错误分类
-            error = handler.handle_error(
-                ConfigurationError("Config error"),
-                context
-            )
-            assert error.category == ErrorCategory.CONFIGURATION
+        handler = PluginErrorHandler(handler_dir)
+        
+        context = ErrorContext(
+            plugin_name="test_plugin",
+            operation="test_operation"
+        )
+        
+        # 测试配置错误分类
+        error = handler.handle_error(
+            ConfigurationError("Config error"),
+            context
+        )
+        assert error.category == ErrorCategory.CONFIGURATION
     
-    def test_recovery_suggestions(self):
+    def test_recovery_suggestions(self, handler_dir):
         """测试恢复建议生成"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            handler = PluginErrorHandler(temp_dir)
-            
-            context = ErrorContext(
-                plugin_name="test_plugin",
-                operation="test_operation"
-            )
-            
-            # 测试验证错误的恢复建议
-            error = handler.handle_error(
-                Exception("Validation failed"),
-                context,
-                ErrorLevel.ERROR,
-                ErrorCategory.VALIDATION
-            )
-            
-            assert len(error.recovery_suggestions) > 0
-            assert any('检查插件配置格式' in suggestion for suggestion in error.recovery_suggestions)
+        handler = PluginErrorHandler(handler_dir)
+        
+        context = ErrorContext(
+            plugin_name="test_plugin",
+            operation="test_operation"
+        )
+        
+        # 测试验证错误的恢复建议
+        error = handler.handle_error(
+            Exception("Validation failed"),
+            context,
+            ErrorLevel.ERROR,
+            ErrorCategory.VALIDATION
+        )
+        
+        assert len(error.recovery_suggestions) > 0
+        assert 'CONFIG_FORMAT_CHECK' in error.recovery_suggestion_codes
     
-    def test_custom_error_handlers(self):
+    def test_custom_error_handlers(self, handler_dir):
         """测试自定义错误处理器"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            handler = PluginErrorHandler(temp_dir)
-            
-            # 注册自定义处理器
-            custom_handler_called = False
-            
-            def custom_handler(error):
-                nonlocal custom_handler_called
-                custom_handler_called = True
-            
-            handler.register_error_handler(ErrorCategory.EXECUTION, custom_handler)
-            
-            # 触发错误
-            context = ErrorContext(
-                plugin_name="test_plugin",
-                operation="test_operation"
-            )
-            
-            handler.handle_error(
-                Exception("Test error"),
-                context,
-                ErrorLevel.ERROR,
-                ErrorCategory.EXECUTION
-            )
-            
-            assert custom_handler_called is True
+        handler = PluginErrorHandler(handler_dir)
+        
+        # 注册自定义处理器
+        custom_handler_called = False
+        
+        def custom_handler(error):
+            nonlocal custom_handler_called
+            custom_handler_called = True
+        
+        handler.register_error_handler(ErrorCategory.EXECUTION, custom_handler)
+        
+        # 触发错误
+        context = ErrorContext(
+            plugin_name="test_plugin",
+            operation="test_operation"
+        )
+        
+        handler.handle_error(
+            Exception("Test error"),
+            context,
+            ErrorLevel.ERROR,
+            ErrorCategory.EXECUTION
+        )
+        
+        assert custom_handler_called is True
 
 
 class TestPerformanceMonitor:
     """测试性能监控器"""
     
-    def test_performance_monitor_initialization(self):
+    def test_performance_monitor_initialization(self, monitor_dir):
         """测试性能监控器初始化"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            monitor = PluginPerformanceMonitor(temp_dir)
-            
-            # 验证性能数据初始化
-            assert 'plugin_load_times' in monitor.performance_data
-            assert 'plugin_execution_times' in monitor.performance_data
+        monitor = PluginPerformanceMonitor(monitor_dir)
+        
+        # 验证性能数据初始化
+        assert 'plugin_load_times' in monitor.performance_data
+        assert 'plugin_execution_times' in monitor.performance_data
     
-    def test_plugin_load_timing(self):
+    def test_plugin_load_timing(self, monitor_dir):
         """测试插件加载计时"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            monitor = PluginPerformanceMonitor(temp_dir)
-            
-            # 开始计时
-            timer_id = monitor.start_plugin_load_timer("test_plugin")
-            
-            # 模拟加载时间
-            time.sleep(0.1)
-            
-            # 结束计时
-            monitor.end_plugin_load_timer("test_plugin", timer_id)
-            
-            # 验证计时数据
-            summary = monitor.get_plugin_performance_summary("test_plugin")
-            assert summary['load_time'] is not None
-            assert summary['load_time'] >= 0.1
+        # 用可控时钟模拟 0.15s 的加载时间，无需真实等待
+        clock = iter([0.0, 0.15]).__next__
+        monitor = PluginPerformanceMonitor(monitor_dir, clock=clock)
+        
+        # 开始计时
+        timer_id = monitor.start_plugin_load_timer("test_plugin")
+        
+        # 结束计时
+        monitor.end_plugin_load_timer("test_plugin", timer_id)
+        
+        # 验证计时数据
+        summary = monitor.get_plugin_performance_summary("test_plugin")
+        assert summary['load_time'] == pytest.approx(0.15)
     
-    def test_execution_time_recording(self):
+    def test_execution_time_recording(self, monitor_dir):
         """测试执行时间记录"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            monitor = PluginPerformanceMonitor(temp_dir)
-            
-            # 记录执行时间
-            monitor.record_plugin_execution(
-                "test_plugin",
-                "test_operation",
-                0.05,
-                True
-            )
-            
-            # 验证执行数据
-            summary = monitor.get_plugin_performance_summary("test_plugin")
-            assert summary['execution_stats']['total_operations'] == 1
-            assert summary['execution_stats']['successful_operations'] == 1
-            assert summary['execution_stats']['average_duration'] == 0.05
+        monitor = PluginPerformanceMonitor(monitor_dir)
+        
+        # 记录执行时间
+        monitor.record_plugin_execution(
+            "test_plugin",
+            "test_operation",
+            0.05,
+            True
+        )
+        
+        # 验证执行数据
+        summary = monitor.get_plugin_performance_summary("test_plugin")
+        assert summary['execution_stats']['total_operations'] == 1
+        assert summary['execution_stats']['successful_operations'] == 1
+        assert summary['execution_stats']['average_duration'] == 0.05
     
-    def test_system_performance_summary(self):
+    def test_system_performance_summary(self, monitor_dir):
         """测试系统性能摘要"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            monitor = PluginPerformanceMonitor(temp_dir)
-            
-            # 添加一些测试数据
-            monitor.record_plugin_execution("plugin1", "op1", 0.1, True)
-            monitor.record_plugin_execution("plugin2", "op2", 0.2, True)
-            monitor.record_plugin_execution("plugin1", "op3", 0.15, False)
-            
-            # 获取系统摘要
-            summary = monitor.get_system_performance_summary()
-            
-            assert summary['total_operations'] == 3
-            # total_plugins 仅统计加载时间，所以这里我们只验证操作数
-            assert summary['average_execution_time'] == pytest.approx(0.15, rel=1e-2)
+        monitor = PluginPerformanceMonitor(monitor_dir)
+        
+        # 添加一些测试数据
+        monitor.record_plugin_execution("plugin1", "op1", 0.1, True)
+        monitor.record_plugin_execution("plugin2", "op2", 0.2, True)
+        monitor.record_plugin_execution("plugin1", "op3", 0.15, False)
+        
+        # 获取系统摘要
+        summary = monitor.get_system_performance_summary()
+        
+        assert summary['total_operations'] == 3
+        # total_plugins 仅统计加载时间，所以这里我们只验证操作数
+        assert summary['average_execution_time'] == pytest.approx(0.15, rel=1e-2)
 
 
+@pytest.mark.slow
 class TestEnhancedPluginManager:
     """测试增强的插件管理器"""
     
-    def test_plugin_manager_with_error_handling(self):
+    def test_plugin_manager_with_error_handling(self, plugin_manager):
         """测试带错误处理的插件管理器"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginManager(str(config_path))
-            
-            # 验证错误处理器和性能监控器已初始化
-            assert manager.error_handler is not None
-            assert manager.performance_monitor is not None
+        # 验证错误处理器和性能监控器已初始化
+        assert plugin_manager.error_handler is not None
+        assert plugin_manager.performance_monitor is not None
     
-    def test_plugin_loading_with_error_handling(self):
+    def test_plugin_loading_with_error_handling(self, plugin_manager):
         """测试带错误处理的插件加载"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginManager(str(config_path))
-            
-            # 测试加载不存在的插件
-            result = manager.load_plugin("nonexistent_plugin")
-            assert result is False
-            
-            # 验证错误统计更新
-            stats = manager.error_handler.get_error_stats()
-            assert stats['total_errors'] > 0
+        # 测试加载不存在的插件
+        result = plugin_manager.load_plugin("nonexistent_plugin")
+        assert result is False
+        
+        # 验证错误统计更新
+        stats = plugin_manager.error_handler.get_error_stats()
+        assert stats['total_errors'] > 0
     
-    def test_plugin_performance_tracking(self):
+    def test_plugin_performance_tracking(self, config_path):
         """测试插件性能跟踪"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginManager(str(config_path))
-            
-            # 创建测试插件
-            class TestPlugin(PluginInterface):
-                @property
-                def metadata(self):
-                    return PluginMetadata(
-                        name="test_plugin",
-                        version="1.0.0",
-                        description="Test plugin",
-                        author="Test",
-                        plugin_type=PluginType.PROCESSOR
-                    )
-                
-                def initialize(self):
-                    return True
-                
-                def cleanup(self):
-                    pass
-                
-                def process(self, data):
-                    return data
-            
-            # 模拟插件加载和执行
-            manager.plugins["test_plugin"] = TestPlugin()
-            manager.plugin_metadata["test_plugin"] = TestPlugin().metadata
-            manager.plugin_status["test_plugin"] = PluginStatus.ENABLED
-            
-            # 执行数据处理
-            result = manager.process_data("test_data")
-            assert result == "test_data"
-            
-            # 验证性能记录
-            summary = manager.performance_monitor.get_plugin_performance_summary("test_plugin")
-            # 如果插件没有在类型索引中，可能不会有执行记录
-            # 所以我们只检查摘要结构是否正确
-            assert 'execution_stats' in summary
+        manager = PluginManager(str(config_path))
+        
+        # 创建测试插件
+        plugin_cls = make_test_plugin()
+        
+        # 模拟插件加载和执行
+        plugin = plugin_cls()
+        manager.plugins["test_plugin"] = plugin
+        manager.plugin_metadata["test_plugin"] = plugin.metadata
+        manager.plugin_status["test_plugin"] = PluginStatus.ENABLED
+        
+        # 执行数据处理
+        result = manager.process_data("test_data")
+        assert result == "test_data"
+        
+        # 验证性能记录
+        summary = manager.performance_monitor.get_plugin_performance_summary("test_plugin")
+        # 如果插件没有在类型索引中，可能不会有执行记录
+        # 所以我们只检查摘要结构是否正确
+        assert 'execution_stats' in summary
     
-    def test_plugin_health_monitoring(self):
+    def test_plugin_health_monitoring(self, config_path):
         """测试插件健康监控"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginManager(str(config_path))
-            
-            # 创建测试插件
-            class TestPlugin(PluginInterface):
-                @property
-                def metadata(self):
-                    return PluginMetadata(
-                        name="test_plugin",
-                        version="1.0.0",
-                        description="Test plugin",
-                        author="Test",
-                        plugin_type=PluginType.PROCESSOR,
-                        dependencies=["missing_dependency"]
-                    )
-                
-                def initialize(self):
-                    return True
-                
-                def cleanup(self):
-                    pass
-            
-            # 添加插件
-            manager.plugins["test_plugin"] = TestPlugin()
-            manager.plugin_metadata["test_plugin"] = TestPlugin().metadata
-            manager.plugin_status["test_plugin"] = PluginStatus.ENABLED
-            
-            # 检查插件健康状态
-            health = manager.get_plugin_health("test_plugin")
-            assert health['dependency_status'] == 'missing'
-            
-            # 检查系统健康状态
-            system_health = manager.get_system_health()
-            assert len(system_health['dependency_conflicts']) > 0
+        manager = PluginManager(str(config_path))
+        
+        # 创建测试插件
+        plugin_cls = make_test_plugin(dependencies=["missing_dependency"])
+        
+        # 添加插件
+        plugin = plugin_cls()
+        manager.plugins["test_plugin"] = plugin
+        manager.plugin_metadata["test_plugin"] = plugin.metadata
+        manager.plugin_status["test_plugin"] = PluginStatus.ENABLED
+        
+        # 检查插件健康状态
+        health = manager.get_plugin_health("test_plugin")
+        assert health['dependency_status'] == 'missing'
+        
+        # 检查系统健康状态
+        system_health = manager.get_system_health()
+        assert len(system_health['dependency_conflicts']) > 0
     
-    def test_configuration_integration(self):
+    def test_configuration_integration(self, plugin_manager):
         """测试配置集成"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "test_config.yaml"
-            manager = PluginManager(str(config_path))
-            
-            # 测试配置来源信息
-            source = manager.config.get_config_source('plugin_directories')
-            assert source is not None
-            
-            # 测试配置信息获取
-            config_info = manager.config.get_config_info()
-            assert 'plugin_directories' in config_info
-            assert config_info['plugin_directories']['source'] == 'default'
+        # 测试配置来源信息
+        source = plugin_manager.config.get_config_source('plugin_directories')
+        assert source is not None
+        
+        # 测试配置信息获取
+        config_info = plugin_manager.config.get_config_info()
+        assert 'plugin_directories' in config_info
+        assert config_info['plugin_directories']['source'] == 'default'
 
 
 if __name__ == "__main__":
@@ -4,17 +4,18 @@ Tests for the new modular architecture.
 This module contains tests for the refactored AI Commit components.
 """
 
+import inspect
+import io
 import unittest
-import os
-import tempfile
-import time
 import subprocess
 import logging
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import patch
 from pathlib import Path
 
+import pytest
+
 # Import the new modular components
-from ai_commit.config import AICommitConfig, ConfigurationLoader
+from ai_commit.config import AICommitConfig
 from ai_commit.security import APIKeyManager, InputValidator
 from ai_commit.git import GitOperations
 from ai_commit.ai import AIClient
@@ -24,34 +25,72 @@ from ai_commit.exceptions import (
     SecurityError, ValidationError
 )
 
+from tests.helpers import completed
+
+
+# Canned stdout for the git commands exercised by these tests, keyed on argv[1:]
+_GIT_STDOUT = {
+    ('rev-parse', '--git-dir'): ".git\n",
+    ('rev-parse', '--abbrev-ref', 'HEAD'): "main\n",
+}
+
+
+def _fake_git_run(args, **kwargs):
+    """Stand-in for subprocess.run that answers git commands from _GIT_STDOUT."""
+    return completed(_GIT_STDOUT[tuple(args[1:])])
+
+
+def _memory_file_handler(opened):
+    """Build a logging.FileHandler stand-in that writes to memory.
+
+    Each log file path the code asks for is recorded in ``opened`` together
+    with the StringIO that receives its records.
+    """
+    def factory(filename, *args, **kwargs):
+        opened[Path(filename)] = stream = io.StringIO()
+        return logging.StreamHandler(stream)
+    return factory
+
+
+@pytest.fixture(scope="module")
+def shared_tmp(tmp_path_factory):
+    """One parent temp directory for the module; tests take their own subdirectory."""
+    return tmp_path_factory.mktemp("ai_commit_tests")
 
+
+@pytest.fixture
+def temp_dir(request, shared_tmp):
+    """Give a unittest-style test ``self.temp_dir``, a subdirectory of ``shared_tmp``."""
+    path = shared_tmp / request.node.name
+    path.mkdir()
+    request.instance.temp_dir = path
+
+
+def _start_class_patch(cls, target, **kwargs):
+    """Start a patch that stays active for the whole test class."""
+    patcher = patch(target, **kwargs)
+    mock = patcher.start()
+    cls.addClassCleanup(patcher.stop)
+    return mock
+
+
+@pytest.mark.usefixtures("temp_dir")
 class TestModularArchitecture(unittest.TestCase):
     """Test cases for the new modular architecture."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_config = AICommitConfig(
+    @classmethod
+    def setUpClass(cls):
+        """Set up read-only fixtures shared by every test in the class."""
+        cls.validator = InputValidator()
+        cls.test_config = AICommitConfig(
             openai_api_key="sk-test-key-1234567890abcdef",
             openai_base_url="https://api.openai.com/v1",
             openai_model="gpt-3.5-turbo"
         )
     
-    def test_config_validation(self):
-        """Test configuration validation."""
-        # Test valid configuration
-        self.assertIsInstance(self.test_config, AICommitConfig)
-        
-        # Test invalid API key
-        with self.assertRaises(ConfigurationError):
-            AICommitConfig(
-                openai_api_key="invalid-key",
-                openai_base_url="https://api.openai.com/v1",
-                openai_model="gpt-3.5-turbo"
-            )
-    
     def test_input_validator(self):
         """Test input validation functionality."""
-        validator = InputValidator()
+        validator = self.validator
         
         # Test valid git diff
         valid_diff = "diff --git a/test.py b/test.py\n+print('hello')"
@@ -71,156 +110,118 @@ class TestModularArchitecture(unittest.TestCase):
         with self.assertRaises(ValidationError):
             validator.validate_commit_message("")
     
-    def test_api_key_manager(self):
-        """Test API key management (mocked)."""
-        with patch('keyring.get_keyring'):
-            api_key_manager = APIKeyManager()
-            
-            # Test that methods exist and can be called
-            self.assertTrue(hasattr(api_key_manager, 'store_api_key'))
-            self.assertTrue(hasattr(api_key_manager, 'get_api_key'))
-            self.assertTrue(hasattr(api_key_manager, 'delete_api_key'))
-    
-    def test_file_selector(self):
-        """Test file selector functionality."""
-        file_selector = FileSelector()
-        
-        # Test that methods exist
-        self.assertTrue(hasattr(file_selector, 'display_file_changes'))
-        self.assertTrue(hasattr(file_selector, 'select_files_interactive'))
-    
-    @patch('ai_commit.git.subprocess.run')
-    def test_git_operations(self, mock_run):
-        """Test git operations."""
-        git_ops = GitOperations()
-        
-        # Mock successful git rev-parse
-        mock_run.return_value = MagicMock(returncode=0, stdout=".git\n")
-        
-        # Test git repository validation
-        try:
-            git_ops.validate_git_repository()
-        except GitOperationError:
-            self.fail("validate_git_repository raised GitOperationError unexpectedly")
-        
-        # Test get current branch
-        mock_run.return_value = MagicMock(returncode=0, stdout="main\n")
-        git_ops.disable_cache_for_testing()
-        branch = git_ops.get_current_branch()
-        self.assertEqual(branch, "main")
-        git_ops.enable_cache_for_testing()
-    
     def test_ai_client_initialization(self):
         """Test AI client initialization."""
         # Test successful initialization
         ai_client = AIClient(self.test_config)
         self.assertIsInstance(ai_client, AIClient)
-        
-        # Test methods exist
-        self.assertTrue(hasattr(ai_client, 'generate_commit_message'))
-        self.assertTrue(hasattr(ai_client, 'test_connection'))
     
     def test_logging_manager(self):
         """Test logging manager."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            logging_manager = LoggingManager(temp_dir)
-            
-            # Test that logger is created
-            logger = logging_manager.get_logger()
-            self.assertIsNotNone(logger)
-            
-            # Test secure logger
-            secure_logger = logging_manager.get_secure_logger()
-            self.assertIsNotNone(secure_logger)
-
-
-class TestConfigurationLoader(unittest.TestCase):
-    """Test configuration loading from various sources."""
-    
-    def test_environment_variable_loading(self):
-        """Test loading configuration from environment variables."""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'sk-env-test-key-1234567890abcdef',
-            'OPENAI_BASE_URL': 'https://api.openai.com/v1',
-            'OPENAI_MODEL': 'gpt-4',
-        }):
-            config_loader = ConfigurationLoader()
-            
-            # Mock file finding to return no config files
-            with patch.object(config_loader, '_find_config_files', return_value=(None, None)):
-                config = config_loader.load_config()
-                
-                self.assertEqual(config.openai_api_key, 'sk-env-test-key-1234567890abcdef')
-                self.assertEqual(config.openai_model, 'gpt-4')
-
-
-class TestBoundaryConditions(unittest.TestCase):
+        with patch('logging.FileHandler', _memory_file_handler({})):
+            logging_manager = LoggingManager(str(self.temp_dir))
+        
+        # Test that logger is created
+        logger = logging_manager.get_logger()
+        self.assertIsNotNone(logger)
+        
+        # Test secure logger
+        secure_logger = logging_manager.get_secure_logger()
+        self.assertIsNotNone(secure_logger)
+
+
+@pytest.mark.parametrize("operation,expected", [
+    # Repository validation returns None (raises GitOperationError on failure)
+    ("validate_git_repository", None),
+    ("get_current_branch", "main"),
+])
+def test_git_operations(operation, expected):
+    """Test git operations against the canned git output table."""
+    # A fresh GitOperations per case, so its result cache starts empty
+    git_ops = GitOperations(runner=_fake_git_run)
+    assert getattr(git_ops, operation)() == expected
+
+
+# Public methods each component must expose, checked on the class without instantiating it
+_EXPECTED_METHODS = {
+    APIKeyManager: ('store_api_key', 'get_api_key', 'delete_api_key'),
+    FileSelector: ('display_file_changes', 'select_files_interactive'),
+    AIClient: ('generate_commit_message', 'test_connection'),
+}
+
+
+@pytest.mark.parametrize(
+    "component,methods", list(_EXPECTED_METHODS.items()),
+    ids=[component.__name__ for component in _EXPECTED_METHODS]
+)
+def test_component_interface(component, methods):
+    """Test that each component defines its public methods."""
+    defined = {name for name, _ in inspect.getmembers(component, predicate=inspect.isfunction)}
+    assert set(methods) <= defined
+
+
+class TestBoundaryConditions:
     """Test boundary conditions and edge cases."""
     
-    def test_empty_git_diff_validation(self):
+    @classmethod
+    def setup_class(cls):
+        """Set up a validator shared by every test in the class."""
+        cls.validator = InputValidator()
+    
+    @pytest.mark.parametrize("diff", ["", "   "])
+    def test_empty_git_diff_validation(self, diff):
         """Test validation of empty git diff."""
-        validator = InputValidator()
-        
-        with self.assertRaises(ValidationError):
-            validator.validate_git_diff("")
-        
-        with self.assertRaises(ValidationError):
-            validator.validate_git_diff("   ")
+        with pytest.raises(ValidationError):
+            self.validator.validate_git_diff(diff)
     
-    def test_large_git_diff_validation(self):
+    @pytest.mark.parametrize("extra,should_raise", [
+        (0, False),  # Exactly at the limit
+        (1, True),   # One byte over the limit
+    ])
+    def test_large_git_diff_validation(self, extra, should_raise):
         """Test validation of large git diff."""
-        validator = InputValidator()
+        large_diff = "a" * (InputValidator.MAX_DIFF_SIZE + extra)
         
-        # Create a diff that's exactly at the limit
-        large_diff = "a" * (1024 * 1024)  # 1MB
-        validated_diff = validator.validate_git_diff(large_diff)
-        self.assertEqual(validated_diff, large_diff)
-        
-        # Test diff that's too large
-        too_large_diff = "a" * (1024 * 1024 + 1)  # 1MB + 1 byte
-        with self.assertRaises(ValidationError):
-            validator.validate_git_diff(too_large_diff)
+        if should_raise:
+            with pytest.raises(ValidationError):
+                self.validator.validate_git_diff(large_diff)
+        else:
+            # Nothing to strip, so the same object comes back; avoids a full-string compare
+            assert self.validator.validate_git_diff(large_diff) is large_diff
     
-    def test_commit_message_length_validation(self):
+    @pytest.mark.parametrize("length,should_raise", [
+        (InputValidator.MAX_COMMIT_MESSAGE_LENGTH, False),
+        (InputValidator.MAX_COMMIT_MESSAGE_LENGTH + 1, True),
+    ])
+    def test_commit_message_length_validation(self, length, should_raise):
         """Test validation of commit message length."""
-        validator = InputValidator()
+        message = "a" * length
         
-        # Test message that's exactly at the limit
-        long_message = "a" * 200
-        validated_message = validator.validate_commit_message(long_message)
-        self.assertEqual(validated_message, long_message)
-        
-        # Test message that's too long
-        too_long_message = "a" * 201
-        with self.assertRaises(ValidationError):
-            validator.validate_commit_message(too_long_message)
+        if should_raise:
+            with pytest.raises(ValidationError):
+                self.validator.validate_commit_message(message)
+        else:
+            assert self.validator.validate_commit_message(message) == message
     
-    def test_sensitive_data_detection_edge_cases(self):
-        """Test sensitive data detection with various edge cases."""
-        validator = InputValidator()
-        
-        # Test strings that look like but aren't API keys
-        safe_strings = [
-            "sk-test",  # Too short
-            "not-a-key",  # Wrong format
-            "sk-123",  # Too short
-            "ghp_",  # Incomplete GitHub token
-        ]
-        
-        for safe_string in safe_strings:
-            try:
-                validator.validate_git_diff(f"diff --git a/test.py b/test.py\n+{safe_string}")
-            except ValidationError:
-                self.fail(f"False positive detected for safe string: {safe_string}")
+    @pytest.mark.parametrize("safe_string", [
+        "sk-test",  # Too short
+        "not-a-key",  # Wrong format
+        "sk-123",  # Too short
+        "ghp_",  # Incomplete GitHub token
+    ])
+    def test_sensitive_data_detection_edge_cases(self, safe_string):
+        """Test that strings which look like (but aren't) API keys are not flagged."""
+        # Raises ValidationError on a false positive
+        self.validator.validate_git_diff(f"diff --git a/test.py b/test.py\n+{safe_string}")
     
     def test_progress_manager_context_manager(self):
         """Test ProgressManager context manager functionality."""
         with ProgressManager() as pm:
-            self.assertIsNotNone(pm)
+            assert pm is not None
             pm.show_operation("Test operation")
         
         # Test that cleanup was called
-        self.assertIsNone(pm.current_operation)
+        assert pm.current_operation is None
     
     def test_logging_manager_singleton(self):
         """Test LoggingManager singleton pattern."""
@@ -229,52 +230,58 @@ class TestBoundaryConditions(unittest.TestCase):
         lm2 = LoggingManager()
         
         # They should be the same instance
-        self.assertIs(lm1, lm2)
+        assert lm1 is lm2
         
         # Test get_instance method
         lm3 = LoggingManager.get_instance()
-        self.assertIs(lm1, lm3)
+        assert lm1 is lm3
 
 
+@pytest.mark.usefixtures("temp_dir")
 class TestIntegrationScenarios(unittest.TestCase):
     """Test integration scenarios and real-world usage patterns."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch git once for the whole class."""
+        cls.mock_run = _start_class_patch(cls, 'ai_commit.git.subprocess.run', side_effect=_fake_git_run)
+    
     def test_complete_workflow_simulation(self):
         """Test a complete workflow simulation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create test configuration
-            config = AICommitConfig(
-                openai_api_key="sk-test-key-1234567890abcdef",
-                openai_base_url="https://api.openai.com/v1",
-                openai_model="gpt-3.5-turbo",
-                log_path=temp_dir
-            )
-            
-            # Test git operations with mocked git
-            with patch('ai_commit.git.subprocess.run') as mock_run:
-                mock_run.return_value = MagicMock(returncode=0, stdout=".git\n")
-                git_ops = GitOperations()
-                git_ops.validate_git_repository()
-            
-            # Test file selector
-            file_selector = FileSelector()
-            self.assertIsNotNone(file_selector)
-            
-            # Test logging manager
-            # Reset singleton for testing to ensure fresh initialization
-            LoggingManager._instance = None
-            LoggingManager._initialized = False
-            logging_manager = LoggingManager(temp_dir)
-            logger = logging_manager.get_logger()
-            self.assertIsNotNone(logger)
-            
-            # Test logging - log a message to ensure file creation
-            logger.info("Test log message")
-            logging_manager.log_with_details(logging.INFO, "Test message with details", "Test details")
-            
-            # Test that log file was created
-            log_files = list(Path(temp_dir).glob("commit_*.log"))
-            self.assertGreater(len(log_files), 0)
+        # Create test configuration
+        config = AICommitConfig(
+            openai_api_key="sk-test-key-1234567890abcdef",
+            openai_base_url="https://api.openai.com/v1",
+            openai_model="gpt-3.5-turbo",
+            log_path=str(self.temp_dir)
+        )
+        
+        # Test git operations with mocked git
+        git_ops = GitOperations()
+        git_ops.validate_git_repository()
+        
+        # Test file selector
+        file_selector = FileSelector()
+        self.assertIsNotNone(file_selector)
+        
+        # Test logging manager
+        # Reset singleton for testing to ensure fresh initialization
+        LoggingManager.reset_for_testing()
+        opened = {}
+        with patch('logging.FileHandler', _memory_file_handler(opened)):
+            logging_manager = LoggingManager(str(self.temp_dir))
+        logger = logging_manager.get_logger()
+        self.assertIsNotNone(logger)
+        
+        # Test logging - log a message to the (in-memory) log file
+        logger.info("Test log message")
+        logging_manager.log_with_details(logging.INFO, "Test message with details", "Test details")
+        
+        # Test that the log file was opened in the log directory and received the records
+        (log_file, stream), = opened.items()
+        self.assertEqual(log_file.parent, self.temp_dir)
+        self.assertTrue(log_file.match("commit_*.log"))
+        self.assertIn("Test log message", stream.getvalue())
     
     def test_error_handling_scenarios(self):
         """Test various error handling scenarios."""
@@ -287,12 +294,12 @@ class TestIntegrationScenarios(unittest.TestCase):
             )
         
         # Test git operation error
-        with patch('ai_commit.git.subprocess.run') as mock_run:
-            mock_run.side_effect = subprocess.CalledProcessError(1, 'git')
-            git_ops = GitOperations()
-            
-            with self.assertRaises(GitOperationError):
-                git_ops.validate_git_repository()
+        self.mock_run.side_effect = subprocess.CalledProcessError(1, 'git')
+        self.addCleanup(setattr, self.mock_run, 'side_effect', _fake_git_run)
+        git_ops = GitOperations()
+        
+        with self.assertRaises(GitOperationError):
+            git_ops.validate_git_repository()
     
     def test_performance_scenarios(self):
         """Test performance-related scenarios."""
@@ -300,15 +307,11 @@ class TestIntegrationScenarios(unittest.TestCase):
         large_file_list = [f"file_{i}.py" for i in range(1000)]
         
         file_selector = FileSelector()
-        
-        # Test file selector initialization (avoid interactive input in tests)
-        start_time = time.time()
-        # Just test that the file selector can handle large lists without interactive selection
         self.assertIsNotNone(file_selector)
-        end_time = time.time()
         
-        # Should complete quickly
-        self.assertLess(end_time - start_time, 1.0)
+        # Run the whole list through the bulk size filter (no interactive input);
+        # missing files are never too large, so every path comes back in order
+        self.assertEqual(file_selector._filter_large_files(large_file_list), large_file_list)
 
 
 if __name__ == '__main__':
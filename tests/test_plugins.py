@@ -5,10 +5,7 @@
 """
 
 import unittest
-import tempfile
-import os
-from unittest.mock import patch, MagicMock
-from pathlib import Path
+import pytest
 
 from ai_commit.plugins import (
     PluginManager, PluginConfig, PluginInterface, PluginMetadata,
@@ -23,24 +20,37 @@ from ai_commit.exceptions import PluginError
 class TestPluginSystem(unittest.TestCase):
     """测试插件系统"""
     
+    @classmethod
+    def setUpClass(cls):
+        """整个测试类共享一个插件管理器（只构建一次，配置仅保存在内存中）"""
+        cls.plugin_manager = PluginManager(config=PluginConfig.from_dict())
+        cls.addClassCleanup(cls.plugin_manager.cleanup)
+    
+    @pytest.fixture(autouse=True)
+    def _temp_dir(self, tmp_path):
+        """使用 pytest 的 tmp_path 作为临时目录（每个测试、每个 xdist 进程独立，自动清理）"""
+        self.temp_dir = tmp_path
+    
     def setUp(self):
-        """设置测试环境"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_path = os.path.join(self.temp_dir, "test_plugins.yaml")
-        self.plugin_manager = PluginManager(self.config_path)
+        """设置测试环境：每个测试使用全新的内存配置，并记录共享插件管理器的插件注册表"""
+        manager = self.plugin_manager
+        manager.config = PluginConfig.from_dict()
+        self._snapshot = (
+            dict(manager.plugins),
+            dict(manager.plugin_metadata),
+            dict(manager.plugin_status),
+            {plugin_type: list(names) for plugin_type, names in manager.plugin_types.items()},
+        )
     
     def tearDown(self):
-        """清理测试环境"""
-        if os.path.exists(self.config_path):
-            os.remove(self.config_path)
-        # 清理临时目录中的所有文件
-        import shutil
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        """恢复共享插件管理器的插件注册表，避免测试之间相互影响"""
+        manager = self.plugin_manager
+        (manager.plugins, manager.plugin_metadata, manager.plugin_status,
+         manager.plugin_types) = self._snapshot
     
     def test_plugin_config(self):
         """测试插件配置"""
-        config = PluginConfig(self.config_path)
+        config = PluginConfig.from_dict()
         
         # 测试默认配置
         self.assertIn('plugin_directories', config.config)
@@ -169,8 +179,53 @@ class TestPluginSystem(unittest.TestCase):
     
     def test_plugin_loading_and_management(self):
         """测试插件加载和管理"""
+        # 创建测试插件（内存中定义，无需写入插件文件）
+        class TestPlugin(HookPlugin):
+            @property
+            def metadata(self):
+                return PluginMetadata(
+                    name="test_plugin",
+                    version="1.0.0",
+                    description="Test plugin",
+                    author="Test Author",
+                    plugin_type=PluginType.HOOK
+                )
+            
+            def initialize(self):
+                self._initialized = True
+                return True
+            
+            def cleanup(self):
+                pass
+            
+            def execute_hook(self, context):
+                return {'test_result': True}
+        
+        # 测试插件加载
+        self.assertTrue(self.plugin_manager.load_plugin('test_plugin', TestPlugin))
+        
+        # 测试插件获取
+        plugin = self.plugin_manager.get_plugin('test_plugin')
+        self.assertIsNotNone(plugin)
+        self.assertIsInstance(plugin, HookPlugin)
+        
+        # 测试插件启用
+        self.assertTrue(self.plugin_manager.enable_plugin('test_plugin'))
+        self.assertTrue(plugin.is_enabled())
+        
+        # 测试插件禁用
+        self.assertTrue(self.plugin_manager.disable_plugin('test_plugin'))
+        self.assertFalse(plugin.is_enabled())
+        
+        # 测试插件卸载
+        self.assertTrue(self.plugin_manager.unload_plugin('test_plugin'))
+        self.assertIsNone(self.plugin_manager.get_plugin('test_plugin'))
+    
+    @pytest.mark.slow
+    def test_plugin_discovery_from_disk(self):
+        """测试从插件目录发现并加载插件"""
         # 创建测试插件文件
-        plugin_file = Path(self.temp_dir) / "test_plugin.py"
+        plugin_file = self.temp_dir / "test_plugin.py"
         plugin_file.write_text("""
 from ai_commit.plugins import HookPlugin, PluginMetadata, PluginType
 
@@ -197,7 +252,7 @@ class TestPlugin(HookPlugin):
 """)
         
         # 配置插件目录
-        self.plugin_manager.config.config['plugin_directories'] = [self.temp_dir]
+        self.plugin_manager.config.config['plugin_directories'] = [str(self.temp_dir)]
         self.plugin_manager.config.enable_plugin('test_plugin')
         
         # 测试插件发现
@@ -206,23 +261,7 @@ class TestPlugin(HookPlugin):
         
         # 测试插件加载
         self.assertTrue(self.plugin_manager.load_plugin('test_plugin'))
-        
-        # 测试插件获取
-        plugin = self.plugin_manager.get_plugin('test_plugin')
-        self.assertIsNotNone(plugin)
-        self.assertIsInstance(plugin, HookPlugin)
-        
-        # 测试插件启用
-        self.assertTrue(self.plugin_manager.enable_plugin('test_plugin'))
-        self.assertTrue(plugin.is_enabled())
-        
-        # 测试插件禁用
-        self.assertTrue(self.plugin_manager.disable_plugin('test_plugin'))
-        self.assertFalse(plugin.is_enabled())
-        
-        # 测试插件卸载
-        self.assertTrue(self.plugin_manager.unload_plugin('test_plugin'))
-        self.assertIsNone(self.plugin_manager.get_plugin('test_plugin'))
+        self.assertIsInstance(self.plugin_manager.get_plugin('test_plugin'), HookPlugin)
     
     def test_hook_execution(self):
         """测试钩子执行"""